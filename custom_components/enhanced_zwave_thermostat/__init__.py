@@ -1,52 +1,111 @@
 """Enhanced Z-Wave Thermostat integration for Home Assistant."""
+import asyncio
+import gzip
+import hashlib
 import logging
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.const import Platform
+from homeassistant.helpers.start import async_at_started
 
-from .const import DOMAIN
+from .const import (
+    DOMAIN,
+    CONF_THERMOSTATS,
+    CONF_SELECTED_CLIMATE_ENTITY,
+    CONF_SAFETY_MIN_TEMP,
+    CONF_SAFETY_MAX_TEMP,
+    CONF_SAVE_DELAY,
+    CONF_MAX_CONCURRENT_COMMANDS,
+    CONF_SCHEDULE_JITTER,
+    DEFAULT_SAVE_DELAY,
+    DEFAULT_MAX_CONCURRENT_COMMANDS,
+    DEFAULT_SCHEDULE_JITTER,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS = [Platform.CLIMATE]
 
+CARD_FILENAME = "enhanced-thermostat-card.js"
+CARD_URL = f"/{DOMAIN}/{CARD_FILENAME}"
+# Outlives the domain data: the card stays registered across reloads
+CARD_DATA_KEY = f"{DOMAIN}_card_url"
+
+# Options that apply to the whole integration, kept equal in every entry
+SHARED_OPTIONS = {
+    CONF_SAVE_DELAY: DEFAULT_SAVE_DELAY,
+    CONF_MAX_CONCURRENT_COMMANDS: DEFAULT_MAX_CONCURRENT_COMMANDS,
+    CONF_SCHEDULE_JITTER: DEFAULT_SCHEDULE_JITTER,
+}
+
+
+def entry_thermostats(entry: ConfigEntry) -> List[Dict[str, Any]]:
+    """Return the per-thermostat settings managed by a config entry.
+
+    Multi-thermostat entries keep a list under CONF_THERMOSTATS, edited
+    through the options flow. Single-thermostat entries are returned as a
+    one-item list, with the safety limits from their options applied.
+    """
+    if CONF_THERMOSTATS in entry.options:
+        return list(entry.options[CONF_THERMOSTATS])
+    if CONF_THERMOSTATS in entry.data:
+        return list(entry.data[CONF_THERMOSTATS])
+    thermostat = dict(entry.data)
+    for key in (CONF_SAFETY_MIN_TEMP, CONF_SAFETY_MAX_TEMP):
+        if key in entry.options:
+            thermostat[key] = entry.options[key]
+    return [thermostat]
+
+
+def _shared_options(options: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the integration-wide settings from an entry's options."""
+    return {key: options.get(key, default) for key, default in SHARED_OPTIONS.items()}
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Enhanced Z-Wave Thermostat from a config entry."""
-    selected_entity = entry.data.get("selected_climate_entity")
-    _LOGGER.info("Setting up Enhanced Z-Wave Thermostat integration for entity: %s", selected_entity)
+    thermostats = entry_thermostats(entry)
+    selected_entities = [
+        thermostat.get(CONF_SELECTED_CLIMATE_ENTITY) for thermostat in thermostats
+    ]
+    _LOGGER.info(
+        "Setting up Enhanced Z-Wave Thermostat integration for %d entities: %s",
+        len(selected_entities), ", ".join(filter(None, selected_entities)),
+    )
     
+    started = time.monotonic()
     try:
         # Store configuration data
         hass.data.setdefault(DOMAIN, {})
         hass.data[DOMAIN][entry.entry_id] = {
-            "selected_entity": selected_entity,
-            "config": entry.data,
+            "selected_entities": selected_entities,
+            "thermostats": thermostats,
+            # Compared against on update to tell what changed
+            "options": dict(entry.options),
         }
-        
-        # Copy card file to www directory (non-blocking)
-        try:
-            await _ensure_card_file_exists(hass)
-        except Exception as card_err:
-            _LOGGER.warning("Could not setup card file: %s", card_err)
-            # Don't fail the whole setup if card copying fails
-        
-        # Set up services (skip if running in test mode)
-        if not getattr(hass, "_test_mode", False):
-            # Register services only once (first config entry)
-            if not hass.data[DOMAIN].get("services_registered"):
-                try:
-                    from .services import async_setup_services
-                    await async_setup_services(hass)
-                    hass.data[DOMAIN]["services_registered"] = True
-                except Exception as service_err:
-                    _LOGGER.warning("Could not setup services: %s", service_err)
-                    # Don't fail the whole setup if services fail
+
+        await _async_setup_shared(hass, entry)
+        shared_done = time.monotonic()
         
         # Forward the setup to the climate platform
         await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+        platforms_done = time.monotonic()
+
+        # Options changes (including the managed thermostat list) reload the entry
+        entry.async_on_unload(entry.add_update_listener(_async_update_listener))
         
-        _LOGGER.info("Enhanced Z-Wave Thermostat integration setup completed successfully for %s", selected_entity)
+        _LOGGER.info("Enhanced Z-Wave Thermostat integration setup completed successfully for %s", entry.title)
+        _LOGGER.debug(
+            "Setup timing for %s: shared %.3fs, platforms %.3fs, total %.3fs",
+            entry.title,
+            shared_done - started,
+            platforms_done - shared_done,
+            platforms_done - started,
+        )
         return True
         
     except Exception as err:
@@ -54,91 +113,200 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         return False
 
 
-async def _ensure_card_file_exists(hass: HomeAssistant) -> None:
-    """Ensure the Lovelace card file exists in the www directory."""
-    import os
-    import shutil
-    from pathlib import Path
-    
-    try:
-        # Get the component directory
-        component_dir = Path(__file__).parent
-        card_source = component_dir / "www" / "enhanced-thermostat-card.js"
-        
-        # Get Home Assistant config directory
-        config_dir = Path(hass.config.config_dir)
-        www_dir = config_dir / "www"
-        card_dest = www_dir / "enhanced-thermostat-card.js"
-        
-        # Run file operations in executor to avoid blocking the event loop
-        def _copy_card_file():
-            """Copy card file in executor."""
-            try:
-                # Create www directory if it doesn't exist
-                www_dir.mkdir(exist_ok=True)
-                
-                # Copy card file if it doesn't exist or if source is newer
-                if card_source.exists():
-                    if not card_dest.exists() or card_source.stat().st_mtime > card_dest.stat().st_mtime:
-                        shutil.copy2(card_source, card_dest)
-                        return True
-                    return False
-                else:
-                    _LOGGER.warning("Card source file not found: %s", card_source)
-                    return False
-            except Exception as e:
-                _LOGGER.warning("Could not copy card file: %s", e)
-                return False
-        
-        # Execute file operations in thread pool
-        copied = await hass.async_add_executor_job(_copy_card_file)
+async def _async_setup_shared(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Set up what every entry shares, once, taking settings from the first entry.
+
+    The shared settings are the same in every entry; changing them in one
+    copies them to the others (see _async_update_listener).
+
+    Entries can be set up concurrently, so this runs under a lock. The
+    schedule store is loaded here because entities apply their schedule as
+    soon as they are added; serving the card waits until Home Assistant
+    has started.
+    """
+    domain_data = hass.data[DOMAIN]
+    shared = _shared_options(entry.options)
+    async with domain_data.setdefault("setup_lock", asyncio.Lock()):
+        # One setpoint dispatcher shared by every thermostat on the mesh
+        if "dispatcher" not in domain_data:
+            from .commands import SetpointAckTracker, SetpointDispatcher
+            domain_data["shared_options"] = shared
+            domain_data["dispatcher"] = SetpointDispatcher(
+                hass,
+                shared[CONF_MAX_CONCURRENT_COMMANDS],
+                shared[CONF_SCHEDULE_JITTER],
+            )
+            domain_data["ack_tracker"] = SetpointAckTracker(hass)
+        elif shared != domain_data["shared_options"]:
+            # Entries added later follow the settings already in use
+            hass.config_entries.async_update_entry(
+                entry, options={**entry.options, **domain_data["shared_options"]}
+            )
+            domain_data[entry.entry_id]["options"] = dict(entry.options)
+
+        # Kept until unload so reloads don't repeat the housekeeping
+        if "card_setup" not in domain_data:
+            domain_data["card_setup"] = async_at_started(hass, _async_setup_card)
         
-        if copied:
-            _LOGGER.info("Copied enhanced-thermostat-card.js to www directory")
-            # Try to register the resource automatically
-            await _register_card_resource(hass)
-            
-    except Exception as e:
-        _LOGGER.warning("Could not copy card file: %s", e)
+        # Set up services (skip if running in test mode)
+        if getattr(hass, "_test_mode", False) or "schedule_manager" in domain_data:
+            return
+        started = time.monotonic()
+        try:
+            from .services import async_setup_services
+            from .websocket_api import async_register_websocket_commands
+            await async_setup_services(hass, shared[CONF_SAVE_DELAY])
+            async_register_websocket_commands(hass)
+        except Exception as service_err:
+            _LOGGER.warning("Could not setup services: %s", service_err)
+            # Don't fail the whole setup if services fail
+        _LOGGER.debug(
+            "Loaded schedules and registered services in %.3fs", time.monotonic() - started
+        )
 
 
-async def _register_card_resource(hass: HomeAssistant) -> None:
-    """Attempt to register the card resource automatically."""
+async def _async_setup_card(hass: HomeAssistant) -> None:
+    """Serve the card once Home Assistant has started."""
+    if DOMAIN in hass.data:
+        # Started listeners remove themselves once run
+        hass.data[DOMAIN]["card_setup"] = None
+    started = time.monotonic()
     try:
-        # Check if the frontend integration is available
-        if "frontend" not in hass.config.components:
-            _LOGGER.debug("Frontend integration not available, skipping resource registration")
-            return
-            
-        # Create a persistent notification to remind user about manual resource registration
-        hass.components.persistent_notification.async_create(
-            title="Enhanced Z-Wave Thermostat Setup",
-            message=(
-                "Enhanced Z-Wave Thermostat installed successfully!\n\n"
-                "**Next step**: Add the Lovelace card resource:\n"
-                "1. Go to Settings → Dashboards → Resources\n"
-                "2. Click '+ Add Resource'\n"
-                "3. URL: `/local/enhanced-thermostat-card.js?v=1.1.0`\n"
-                "4. Type: JavaScript Module\n"
-                "5. Click 'Create'\n\n"
-                "Then you can add the card to your dashboard!"
-            ),
-            notification_id="enhanced_zwave_thermostat_setup"
+        await _async_register_card(hass)
+    except Exception as card_err:
+        _LOGGER.warning("Could not setup card file: %s", card_err)
+        # Don't fail the whole setup if the card can't be served
+    _LOGGER.debug("Card housekeeping took %.3fs", time.monotonic() - started)
+
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options, reloading the entry unless only shared ones changed.
+
+    Shared settings take effect on the running dispatcher and schedule
+    store at once and are copied to every other entry, so whichever entry
+    sets things up after a restart uses the same values.
+    """
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    previous, entry_data["options"] = entry_data["options"], dict(entry.options)
+
+    shared = _shared_options(entry.options)
+    if shared != _shared_options(previous):
+        _async_apply_shared_options(hass, shared)
+        for other in hass.config_entries.async_entries(DOMAIN):
+            if other.entry_id != entry.entry_id and _shared_options(other.options) != shared:
+                hass.config_entries.async_update_entry(
+                    other, options={**other.options, **shared}
+                )
+
+    changed = {
+        key
+        for key in previous.keys() | entry.options.keys()
+        if previous.get(key) != entry.options.get(key)
+    }
+    if changed - SHARED_OPTIONS.keys():
+        await hass.config_entries.async_reload(entry.entry_id)
+
+
+@callback
+def _async_apply_shared_options(hass: HomeAssistant, shared: Dict[str, Any]) -> None:
+    """Hand new shared settings to the running dispatcher and schedule store."""
+    domain_data = hass.data[DOMAIN]
+    domain_data["shared_options"] = shared
+    if dispatcher := domain_data.get("dispatcher"):
+        dispatcher.async_update_options(
+            shared[CONF_MAX_CONCURRENT_COMMANDS], shared[CONF_SCHEDULE_JITTER]
         )
-        _LOGGER.info("Created setup notification for card resource registration")
-        
-    except Exception as e:
-        _LOGGER.debug("Could not create setup notification: %s", e)
+    if manager := domain_data.get("schedule_manager"):
+        manager.async_set_save_delay(shared[CONF_SAVE_DELAY])
+    _LOGGER.debug("Applied shared settings: %s", shared)
+
+
+def _prepare_card(card_path: Path) -> str:
+    """Return the card's content hash, refreshing its gzipped copy if needed.
+
+    The copy sits next to the card so the static file handler can send it
+    to browsers that accept gzip. It is only rewritten when its content no
+    longer matches the card.
+    """
+    content = card_path.read_bytes()
+    gz_path = card_path.with_name(f"{card_path.name}.gz")
+    try:
+        current = gzip.decompress(gz_path.read_bytes()) == content
+    except (OSError, EOFError):
+        current = False
+    if not current:
+        try:
+            tmp_path = gz_path.with_name(f"{gz_path.name}.tmp")
+            tmp_path.write_bytes(gzip.compress(content, compresslevel=9, mtime=0))
+            tmp_path.replace(gz_path)
+        except OSError as err:
+            # A read-only install still works, just uncompressed
+            _LOGGER.debug("Could not write compressed card: %s", err)
+    return hashlib.sha256(content).hexdigest()[:12]
+
+
+async def _async_register_card(hass: HomeAssistant) -> None:
+    """Serve the Lovelace card from the package and load it in the frontend.
+
+    The URL carries the card's content hash, so it can be cached for a
+    year and still changes with every update. Routes can't be removed, so
+    this happens once per Home Assistant run.
+    """
+    if CARD_DATA_KEY in hass.data:
+        return
+    if "frontend" not in hass.config.components:
+        _LOGGER.debug("Frontend integration not available, skipping card registration")
+        return
+
+    from homeassistant.components.frontend import add_extra_js_url
+    from homeassistant.components.http import StaticPathConfig
+
+    card_path = Path(__file__).parent / "www" / CARD_FILENAME
+    content_hash = await hass.async_add_executor_job(_prepare_card, card_path)
+    await hass.http.async_register_static_paths(
+        [StaticPathConfig(CARD_URL, str(card_path), cache_headers=True)]
+    )
+    url = f"{CARD_URL}?v={content_hash}"
+    add_extra_js_url(hass, url)
+    hass.data[CARD_DATA_KEY] = url
+    _LOGGER.info("Serving Lovelace card at %s", url)
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     _LOGGER.info("Unloading Enhanced Z-Wave Thermostat integration")
     
-    # Unload platforms
+    # Unload platforms; entity listeners are released through async_on_remove
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
+        remaining = [
+            other
+            for other in hass.config_entries.async_entries(DOMAIN)
+            if other.entry_id != entry.entry_id and other.state is ConfigEntryState.LOADED
+        ]
+        if not remaining:
+            await _async_unload_shared(hass)
     
-    return unload_ok
\ No newline at end of file
+    return unload_ok
+
+
+async def _async_unload_shared(hass: HomeAssistant) -> None:
+    """Tear down what the first entry set up for all of them."""
+    domain_data = hass.data[DOMAIN]
+    if "schedule_manager" in domain_data:
+        from .services import async_unload_services
+        await async_unload_services(hass)
+    if unsub_card_setup := domain_data.pop("card_setup", None):
+        unsub_card_setup()
+    domain_data.pop("setup_lock", None)
+
+    if dispatcher := domain_data.pop("dispatcher", None):
+        dispatcher.async_shutdown()
+    if ack_tracker := domain_data.pop("ack_tracker", None):
+        ack_tracker.async_shutdown()
+    domain_data.pop("shared_options", None)
+
+    if not domain_data:
+        hass.data.pop(DOMAIN)
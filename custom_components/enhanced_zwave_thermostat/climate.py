@@ -1,5 +1,6 @@
 """Climate platform for Enhanced Z-Wave Thermostat."""
 import logging
+from dataclasses import dataclass
 from typing import Any
 
 from homeassistant.components.climate import (
@@ -8,36 +9,92 @@ from homeassistant.components.climate import (
     HVACMode,
     HVACAction,
 )
-from homeassistant.components.zwave_js.const import DOMAIN as ZWAVE_JS_DOMAIN
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     ATTR_TEMPERATURE,
     PRECISION_WHOLE,
+    STATE_UNAVAILABLE,
+    STATE_UNKNOWN,
     UnitOfTemperature,
     Platform,
 )
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import Event, HomeAssistant, State, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import EntityCategory
+from homeassistant.helpers.event import (
+    EventStateChangedData,
+    async_track_state_change_event,
+)
+from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers import entity_registry as er, device_registry as dr
+from homeassistant.util import dt as dt_util
 
+from . import entry_thermostats
+from .commands import PRIORITY_MANUAL, PRIORITY_SCHEDULE, SetpointQueue
 from .const import (
     DOMAIN,
+    ZWAVE_JS_DOMAIN,
     CONF_SELECTED_CLIMATE_ENTITY,
     ATTR_NEXT_SETPOINT_TIME,
     ATTR_NEXT_SETPOINT_TEMP,
     ATTR_SCHEDULES_COUNT,
-    ATTR_ENHANCED_SCHEDULES,
     ATTR_HOLD_MODE,
     ATTR_HOLD_UNTIL,
     ATTR_HOLD_TEMPERATURE,
+    ATTR_SAFETY_OVERRIDE,
+    ATTR_SAFETY_OVERRIDE_UNTIL,
+    SIGNAL_SCHEDULE_CHANGED,
+    SIGNAL_SCHEDULE_DUE,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
 
+_HVAC_MODES = {mode.value: mode for mode in HVACMode}
+_HVAC_ACTIONS = {action.value: action for action in HVACAction}
+
+
+def _as_float(value: Any) -> float | None:
+    """Return value as a float, or None if it is missing or not numeric."""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class SourceSnapshot:
+    """Parsed view of the underlying climate entity's state.
+
+    Built once per state change so entity properties don't have to look up
+    and re-parse the source state on every access.
+    """
+
+    available: bool
+    hvac_mode: HVACMode | None = None
+    hvac_action: HVACAction | None = None
+    current_temperature: float | None = None
+    target_temperature: float | None = None
+
+    @classmethod
+    def from_state(cls, state: State | None) -> "SourceSnapshot":
+        """Build a snapshot, treating missing/unavailable/unknown as unavailable."""
+        if state is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            return cls(available=False)
+        attributes = state.attributes
+        return cls(
+            available=True,
+            hvac_mode=_HVAC_MODES.get(state.state),
+            hvac_action=_HVAC_ACTIONS.get(attributes.get("hvac_action")),
+            current_temperature=_as_float(attributes.get("current_temperature")),
+            target_temperature=_as_float(attributes.get("temperature")),
+        )
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -46,64 +103,94 @@ async def async_setup_entry(
     """Set up Enhanced Z-Wave Thermostat climate entities."""
     _LOGGER.info("Setting up Enhanced Z-Wave Thermostat climate platform for config entry: %s", config_entry.title)
     
-    # Get the selected climate entity from config flow
-    selected_entity_id = config_entry.data.get(CONF_SELECTED_CLIMATE_ENTITY)
-    
-    if not selected_entity_id:
-        _LOGGER.error("No climate entity selected in config entry %s", config_entry.entry_id)
-        return
-    
-    # Get entity and device registries
+    # Get entity and device registries once for every managed thermostat
     entity_registry = er.async_get(hass)
     device_registry = dr.async_get(hass)
     
-    # Get the selected entity from the registry
-    entity_entry = entity_registry.async_get(selected_entity_id)
-    
-    if not entity_entry:
-        _LOGGER.error("Selected climate entity %s not found in registry", selected_entity_id)
-        return
-    
-    if entity_entry.domain != "climate":
-        _LOGGER.error("Selected entity %s is not a climate entity (domain: %s)", selected_entity_id, entity_entry.domain)
-        return
-    
-    _LOGGER.info("Setting up enhanced thermostat for entity: %s", selected_entity_id)
-    
-    # Get device info if available
-    device_entry = device_registry.async_get(entity_entry.device_id) if entity_entry.device_id else None
-    
-    # Create enhanced wrapper entity
-    entity_name = entity_entry.name or entity_entry.original_name or "Thermostat"
-    unique_id = f"enhanced_{selected_entity_id.replace('.', '_')}"
+    entities = []
+    for thermostat in entry_thermostats(config_entry):
+        selected_entity_id = thermostat.get(CONF_SELECTED_CLIMATE_ENTITY)
+        
+        if not selected_entity_id:
+            _LOGGER.error("No climate entity selected in config entry %s", config_entry.entry_id)
+            continue
+        
+        # Get the selected entity from the registry
+        entity_entry = entity_registry.async_get(selected_entity_id)
+        
+        if not entity_entry:
+            _LOGGER.error("Selected climate entity %s not found in registry", selected_entity_id)
+            continue
+        
+        if entity_entry.domain != "climate":
+            _LOGGER.error("Selected entity %s is not a climate entity (domain: %s)", selected_entity_id, entity_entry.domain)
+            continue
+        
+        # Get device info if available
+        device_entry = device_registry.async_get(entity_entry.device_id) if entity_entry.device_id else None
+        
+        # Create enhanced wrapper entity
+        entity_name = entity_entry.name or entity_entry.original_name or "Thermostat"
+        unique_id = f"enhanced_{selected_entity_id.replace('.', '_')}"
+        
+        entities.append(
+            EnhancedZWaveThermostat(
+                hass=hass,
+                config_entry=config_entry,
+                name=f"Enhanced {entity_name}",
+                unique_id=unique_id,
+                selected_entity_id=selected_entity_id,
+                device_entry=device_entry,
+                thermostat_config=thermostat,
+            )
+        )
     
-    enhanced_entity = EnhancedZWaveThermostat(
-        hass=hass,
-        config_entry=config_entry,
-        name=f"Enhanced {entity_name}",
-        unique_id=unique_id,
-        selected_entity_id=selected_entity_id,
-        device_entry=device_entry
+    # One batch for the whole entry
+    async_add_entities(entities, True)
+    _LOGGER.info(
+        "Added %d Enhanced Z-Wave Thermostat entities: %s",
+        len(entities), ", ".join(entity.name for entity in entities),
     )
-    
-    async_add_entities([enhanced_entity], True)
-    _LOGGER.info("Added Enhanced Z-Wave Thermostat entity: %s", enhanced_entity.name)
 
 
-class EnhancedZWaveThermostat(ClimateEntity):
+class EnhancedZWaveThermostat(ClimateEntity, RestoreEntity):
     """Enhanced Z-Wave Thermostat entity."""
     
     _attr_should_poll = False  # We'll subscribe to state changes instead
+    # Schedule summaries change with every edit and are served over the
+    # WebSocket API; keep them out of the recorder
+    _unrecorded_attributes = frozenset({
+        ATTR_SCHEDULES_COUNT,
+        ATTR_NEXT_SETPOINT_TIME,
+        ATTR_NEXT_SETPOINT_TEMP,
+    })
+
+    def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry, name: str, unique_id: str, selected_entity_id=None, device_entry=None, thermostat_config=None):
+        """Initialize the thermostat.
 
-    def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry, name: str, unique_id: str, selected_entity_id=None, device_entry=None):
-        """Initialize the thermostat."""
+        thermostat_config holds this thermostat's safety, home and away
+        values; it defaults to the config entry data.
+        """
         self.hass = hass
         self._config_entry = config_entry
         self._attr_name = name
         self._attr_unique_id = unique_id
         self._selected_entity_id = selected_entity_id
         self._device_entry = device_entry
-        self._state_listener = None
+        # created timestamp of the safety override last applied
+        self._override_key: str | None = None
+        # extra_state_attributes cache, see extra_state_attributes
+        self._attr_cache: dict[str, Any] | None = None
+        self._attr_cache_key: tuple | None = None
+        self._attr_cache_expires = None
+        # Parsed mirror of the underlying entity (None in demo mode)
+        self._source: SourceSnapshot | None = (
+            SourceSnapshot.from_state(hass.states.get(selected_entity_id))
+            if selected_entity_id
+            else None
+        )
+        # Coalesces setpoint writes to the underlying entity (None in demo mode)
+        self._setpoint_queue: SetpointQueue | None = None
         
         # Initialize attributes
         self._attr_temperature_unit = UnitOfTemperature.FAHRENHEIT
@@ -129,14 +216,11 @@ class EnhancedZWaveThermostat(ClimateEntity):
         
         # Enhanced features
         self._schedule_enabled = False
-        self._safety_min_temp = config_entry.data.get("safety_min_temp", 40)
-        self._safety_max_temp = config_entry.data.get("safety_max_temp", 90)
-        self._home_temp = config_entry.data.get("home_temp", 72)
-        self._away_temp = config_entry.data.get("away_temp", 65)
-        
-        # Set up schedule evaluation listener
-        if not getattr(hass, "_test_mode", False):
-            self._setup_schedule_listener()
+        config = thermostat_config if thermostat_config is not None else config_entry.data
+        self._safety_min_temp = config.get("safety_min_temp", 40)
+        self._safety_max_temp = config.get("safety_max_temp", 90)
+        self._home_temp = config.get("home_temp", 72)
+        self._away_temp = config.get("away_temp", 65)
         
         # Device info for Z-Wave devices
         if self._device_entry:
@@ -165,44 +249,39 @@ class EnhancedZWaveThermostat(ClimateEntity):
                 sw_version="0.1.0",
             )
 
+    @property
+    def available(self) -> bool:
+        """Return False while the underlying entity is unavailable."""
+        if self._source is not None:
+            return self._source.available
+        return True
+
     @property
     def current_temperature(self) -> float | None:
         """Return the current temperature."""
-        if self._selected_entity_id:
-            # Get current temperature from underlying Z-Wave entity
-            state = self.hass.states.get(self._selected_entity_id)
-            if state and state.attributes.get("current_temperature"):
-                return float(state.attributes["current_temperature"])
+        if self._source is not None:
+            return self._source.current_temperature
         return self._current_temperature
 
     @property
     def target_temperature(self) -> float | None:
         """Return the temperature we try to reach."""
-        if self._selected_entity_id:
-            # Get target temperature from underlying Z-Wave entity
-            state = self.hass.states.get(self._selected_entity_id)
-            if state and state.attributes.get("temperature"):
-                return float(state.attributes["temperature"])
+        if self._source is not None:
+            return self._source.target_temperature
         return self._target_temperature
 
     @property
     def hvac_mode(self) -> HVACMode | None:
         """Return current operation."""
-        if self._selected_entity_id:
-            # Get HVAC mode from underlying Z-Wave entity
-            state = self.hass.states.get(self._selected_entity_id)
-            if state:
-                return HVACMode(state.state) if state.state in [mode.value for mode in HVACMode] else self._hvac_mode
+        if self._source is not None:
+            return self._source.hvac_mode
         return self._hvac_mode
 
     @property
     def hvac_action(self) -> HVACAction | None:
         """Return the current running hvac operation."""
-        if self._selected_entity_id:
-            # Get HVAC action from underlying Z-Wave entity
-            state = self.hass.states.get(self._selected_entity_id)
-            if state and state.attributes.get("hvac_action"):
-                return HVACAction(state.attributes["hvac_action"])
+        if self._source is not None:
+            return self._source.hvac_action
         return self._hvac_action
 
     @property
@@ -212,7 +291,23 @@ class EnhancedZWaveThermostat(ClimateEntity):
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
-        """Return extra state attributes."""
+        """Return extra state attributes.
+
+        Rebuilt only when the entity's schedule version or schedule mode
+        changed, or the cached next transition has passed.
+        """
+        sched_mgr = self.hass.data.get(DOMAIN, {}).get("schedule_manager")
+        cache_key = (
+            sched_mgr.version(self.entity_id) if sched_mgr else None,
+            self._schedule_enabled,
+        )
+        if (
+            self._attr_cache is not None
+            and self._attr_cache_key == cache_key
+            and (self._attr_cache_expires is None or dt_util.utcnow() < self._attr_cache_expires)
+        ):
+            return self._attr_cache
+
         attrs: dict[str, Any] = {
             "safety_min_temp": self._safety_min_temp,
             "safety_max_temp": self._safety_max_temp,
@@ -220,16 +315,14 @@ class EnhancedZWaveThermostat(ClimateEntity):
             "away_temp": self._away_temp,
             "schedule_enabled": self._schedule_enabled,
         }
+        expires = None
         # Pull schedule manager for next setpoint details
-        sched_mgr = self.hass.data.get(DOMAIN, {}).get("schedule_manager")
         if sched_mgr:
             try:
-                schedules = sched_mgr.list(self.entity_id)
                 next_sp = sched_mgr.next_setpoint(self.entity_id)
                 hold = sched_mgr.active_hold(self.entity_id)
-                attrs[ATTR_SCHEDULES_COUNT] = len(schedules)
-                # Provide raw schedules list for frontend consumption
-                attrs[ATTR_ENHANCED_SCHEDULES] = schedules
+                # Full schedule lists are served by the WebSocket API
+                attrs[ATTR_SCHEDULES_COUNT] = sched_mgr.count(self.entity_id)
                 if next_sp:
                     attrs[ATTR_NEXT_SETPOINT_TIME] = next_sp.get("time")
                     attrs[ATTR_NEXT_SETPOINT_TEMP] = next_sp.get("temperature")
@@ -237,8 +330,16 @@ class EnhancedZWaveThermostat(ClimateEntity):
                     attrs[ATTR_HOLD_MODE] = hold.get("mode")
                     attrs[ATTR_HOLD_UNTIL] = hold.get("until")
                     attrs[ATTR_HOLD_TEMPERATURE] = hold.get("temperature")
+                override = sched_mgr.active_override(self.entity_id)
+                if override:
+                    attrs[ATTR_SAFETY_OVERRIDE] = override.get("temperature")
+                    attrs[ATTR_SAFETY_OVERRIDE_UNTIL] = override.get("until")
+                expires = sched_mgr.next_transition(self.entity_id)
             except Exception:  # noqa: E722 - defensive
                 pass
+        self._attr_cache = attrs
+        self._attr_cache_key = cache_key
+        self._attr_cache_expires = expires
         return attrs
 
     async def async_set_temperature(self, **kwargs: Any) -> None:
@@ -246,9 +347,19 @@ class EnhancedZWaveThermostat(ClimateEntity):
         temperature = kwargs.get(ATTR_TEMPERATURE)
         if temperature is None:
             return
+        await self._async_set_setpoint(temperature, PRIORITY_MANUAL)
 
-        # Apply safety limits
-        if temperature < self._safety_min_temp:
+    async def _async_set_setpoint(
+        self, temperature: float, priority: int, override: bool = False
+    ) -> None:
+        """Clamp and queue a setpoint; priority orders it on the mesh.
+
+        Only a timed safety override's own temperature (override=True)
+        may fall outside the safety limits.
+        """
+        if override:
+            pass
+        elif temperature < self._safety_min_temp:
             _LOGGER.warning(
                 "Temperature %s below safety minimum %s, setting to minimum",
                 temperature, self._safety_min_temp
@@ -262,15 +373,17 @@ class EnhancedZWaveThermostat(ClimateEntity):
             temperature = self._safety_max_temp
 
         # Delegate to underlying Z-Wave entity if available
-        if self._selected_entity_id:
-            await self.hass.services.async_call(
-                "climate",
-                "set_temperature",
-                {
-                    "entity_id": self._selected_entity_id,
-                    "temperature": temperature
-                }
-            )
+        if self._setpoint_queue is not None:
+            # A newer request supersedes any unsent or unacknowledged one, even
+            # if the queue then skips it as already confirmed
+            domain_data = self.hass.data.get(DOMAIN, {})
+            if dispatcher := domain_data.get("dispatcher"):
+                dispatcher.async_cancel(self._selected_entity_id)
+            if ack_tracker := domain_data.get("ack_tracker"):
+                ack_tracker.async_cancel(self._selected_entity_id)
+            await self._setpoint_queue.async_request(temperature, priority)
+        elif self._selected_entity_id:
+            await self._async_send_setpoint(temperature, priority)
         else:
             # Demo mode - just update local state
             self._target_temperature = temperature
@@ -278,6 +391,45 @@ class EnhancedZWaveThermostat(ClimateEntity):
         _LOGGER.info("Setting target temperature to %s", temperature)
         self.async_write_ha_state()
 
+    async def _async_send_setpoint(self, temperature: float, priority: int) -> None:
+        """Hand a setpoint to the shared dispatcher and track its acknowledgement."""
+        domain_data = self.hass.data.get(DOMAIN, {})
+        dispatcher = domain_data.get("dispatcher")
+        ack_tracker = domain_data.get("ack_tracker")
+        if dispatcher is None:
+            await self._async_write_setpoint(temperature)
+            return
+
+        async def _write() -> None:
+            try:
+                await self._async_write_setpoint(temperature)
+            except Exception:
+                # Nothing was sent, so there is nothing to wait for
+                if ack_tracker is not None:
+                    ack_tracker.async_cancel(self._selected_entity_id)
+                raise
+            if ack_tracker is not None:
+                ack_tracker.async_sent(self._selected_entity_id)
+
+        @callback
+        def _submit() -> None:
+            dispatcher.async_submit(self._selected_entity_id, priority, _write)
+
+        if ack_tracker is not None:
+            ack_tracker.async_expect(self._selected_entity_id, temperature, _submit)
+        _submit()
+
+    async def _async_write_setpoint(self, temperature: float) -> None:
+        """Write a setpoint to the underlying Z-Wave entity."""
+        await self.hass.services.async_call(
+            "climate",
+            "set_temperature",
+            {
+                "entity_id": self._selected_entity_id,
+                "temperature": temperature
+            }
+        )
+
     async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
         """Set new target hvac mode."""
         # Delegate to underlying Z-Wave entity if available
@@ -308,32 +460,56 @@ class EnhancedZWaveThermostat(ClimateEntity):
             await self.async_set_temperature(temperature=self._away_temp)
         elif preset_mode == "schedule":
             self._schedule_enabled = True
-            
+            # No periodic poll any more, so apply the current slot right away
+            await self._apply_current_schedule()
+
         _LOGGER.info("Setting preset mode to %s", preset_mode)
         self.async_write_ha_state()
 
     def _setup_schedule_listener(self) -> None:
-        """Set up listener for schedule events."""
-        from homeassistant.helpers.event import async_track_time_interval
-        from datetime import timedelta
-        
-        # Check schedule every minute
-        async def _check_schedule(now):
-            """Check if schedule should be applied."""
-            if self._schedule_enabled and self._preset_mode == "schedule":
-                await self._apply_current_schedule()
-        
-        # Track time intervals for schedule evaluation
-        async_track_time_interval(self.hass, _check_schedule, timedelta(minutes=1))
-        
-        # Listen for schedule update events
-        @callback
-        def _schedule_updated_listener(event):
-            """Handle schedule update events."""
-            if event.data.get("entity_id") == self.entity_id:
-                self.hass.async_create_task(self._apply_current_schedule())
-        
-        self.hass.bus.async_listen(f"{DOMAIN}_schedule_updated", _schedule_updated_listener)
+        """Listen for this entity's schedule signals from the shared scheduler."""
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, SIGNAL_SCHEDULE_DUE.format(self.entity_id), self._async_schedule_signal
+            )
+        )
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, SIGNAL_SCHEDULE_CHANGED.format(self.entity_id), self._async_schedule_signal
+            )
+        )
+
+    @callback
+    def _async_schedule_signal(self) -> None:
+        """Apply the effective setpoint after a transition, change or expiry."""
+        override = self._active_override()
+        override_key = override.get("created") if override else None
+        override_started = override_key is not None and override_key != self._override_key
+        override_ended = self._override_key is not None and override_key is None
+        self._override_key = override_key
+        if self._schedule_active or override_started:
+            # The override temperature takes precedence in the scheduled temperature
+            self.hass.async_create_task(self._apply_current_schedule())
+        elif override_ended and self.target_temperature is not None:
+            # Bring the setpoint back inside the safety limits
+            self.hass.async_create_task(
+                self._async_set_setpoint(self.target_temperature, PRIORITY_SCHEDULE)
+            )
+        # Schedule count, next setpoint and hold attributes change even when
+        # no setpoint is applied
+        self.async_write_ha_state()
+
+    def _active_override(self) -> dict[str, Any] | None:
+        """Return the active timed safety override, if any."""
+        schedule_manager = self.hass.data.get(DOMAIN, {}).get("schedule_manager")
+        if not schedule_manager:
+            return None
+        return schedule_manager.active_override(self.entity_id)
+
+    @property
+    def _schedule_active(self) -> bool:
+        """Return True when the schedule drives the target temperature."""
+        return self._schedule_enabled and self._preset_mode == "schedule"
 
     async def _apply_current_schedule(self) -> None:
         """Apply the current scheduled temperature."""
@@ -345,33 +521,66 @@ class EnhancedZWaveThermostat(ClimateEntity):
         
         if scheduled_temp is not None:
             _LOGGER.info("Applying scheduled temperature %s for %s", scheduled_temp, self.entity_id)
-            await self.async_set_temperature(temperature=scheduled_temp)
+            # An active safety override is what the scheduled temperature returns
+            await self._async_set_setpoint(
+                scheduled_temp,
+                PRIORITY_SCHEDULE,
+                override=schedule_manager.active_override(self.entity_id) is not None,
+            )
 
     async def async_added_to_hass(self) -> None:
         """Run when entity is added to hass."""
         await super().async_added_to_hass()
-        
+
+        # Restore preset so schedule mode survives restarts
+        last_state = await self.async_get_last_state()
+        if last_state:
+            preset = last_state.attributes.get("preset_mode")
+            if preset in self._attr_preset_modes:
+                self._preset_mode = preset
+            self._schedule_enabled = bool(
+                last_state.attributes.get("schedule_enabled", self._schedule_enabled)
+            )
+
+        # The queue and source snapshot must exist before the catch-up below,
+        # so it is debounced and skipped if the device already reports it
         if self._selected_entity_id:
-            # Subscribe to state changes from the underlying Z-Wave entity
-            @callback
-            def _state_listener(event):
-                """Handle state changes from underlying entity."""
-                entity_id = event.data.get("entity_id")
-                if entity_id == self._selected_entity_id:
-                    # Update our state when the underlying entity changes
-                    self.async_write_ha_state()
-            
-            self._state_listener = self.hass.bus.async_listen(
-                "state_changed", _state_listener
+            self._setpoint_queue = SetpointQueue(
+                self.hass,
+                self._selected_entity_id,
+                self._async_send_setpoint,
+                lambda: self.target_temperature,
+            )
+            self.async_on_remove(self._setpoint_queue.async_shutdown)
+            if ack_tracker := self.hass.data.get(DOMAIN, {}).get("ack_tracker"):
+                self.async_on_remove(
+                    lambda: ack_tracker.async_cancel(self._selected_entity_id)
+                )
+            # Subscribe to state changes from the underlying Z-Wave entity only
+            self._source = SourceSnapshot.from_state(
+                self.hass.states.get(self._selected_entity_id)
+            )
+            self.async_on_remove(
+                async_track_state_change_event(
+                    self.hass, [self._selected_entity_id], self._async_source_state_changed
+                )
             )
 
-    async def async_will_remove_from_hass(self) -> None:
-        """Run when entity will be removed from hass."""
-        await super().async_will_remove_from_hass()
-        
-        if self._state_listener:
-            self._state_listener()
-            self._state_listener = None
+        if not getattr(self.hass, "_test_mode", False):
+            self._setup_schedule_listener()
+            # Catch up on any transition or override missed while Home Assistant was down
+            self._async_schedule_signal()
+
+    @callback
+    def _async_source_state_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Refresh the snapshot and write state if a mirrored field changed."""
+        snapshot = SourceSnapshot.from_state(event.data["new_state"])
+        if ack_tracker := self.hass.data.get(DOMAIN, {}).get("ack_tracker"):
+            ack_tracker.async_observe(self._selected_entity_id, snapshot.target_temperature)
+        if snapshot == self._source:
+            return
+        self._source = snapshot
+        self.async_write_ha_state()
 
     async def async_update(self) -> None:
         """Update the entity."""
@@ -0,0 +1,388 @@
+"""Setpoint command handling for Enhanced Z-Wave Thermostat.
+
+Setpoint writes to the underlying Z-Wave entity go through a small
+per-thermostat queue rather than straight to ``climate.set_temperature``,
+so a burst of requests (slider drags, overlapping automations, schedule
+transitions) turns into a single command on the mesh. The resulting
+commands from all thermostats then share one dispatcher that limits how
+many are in flight at once and spreads schedule-driven writes out, so a
+common schedule boundary does not flood the controller. Finally each sent
+setpoint is tracked until the Z-Wave entity reports it, and resent with
+backoff if the node does not confirm it in time.
+"""
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from homeassistant.const import ATTR_TEMPERATURE
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.event import async_call_later
+
+from .const import DEFAULT_MAX_CONCURRENT_COMMANDS, DEFAULT_SCHEDULE_JITTER
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds to collect setpoint requests before writing the latest one
+SETPOINT_DEBOUNCE_COOLDOWN = 0.5
+
+# Dispatch priorities, lower is sent first
+PRIORITY_MANUAL = 0
+PRIORITY_SCHEDULE = 1
+
+# Seconds to wait for a sent setpoint to be reported back, doubled per retry
+SETPOINT_ACK_TIMEOUT = 15
+# Resends before a setpoint is counted as failed
+SETPOINT_MAX_RETRIES = 3
+# Reported setpoints within this distance of the sent value count as applied
+SETPOINT_ACK_TOLERANCE = 0.05
+
+
+class SetpointQueue:
+    """Coalesce setpoint requests for one Z-Wave thermostat.
+
+    Requests made within the debounce window replace each other (last
+    writer wins). When the window closes the remaining value is sent,
+    unless it already matches the setpoint the device last reported.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entity_id: str,
+        send: Callable[[float, int], Awaitable[None]],
+        confirmed: Callable[[], Optional[float]],
+        cooldown: float = SETPOINT_DEBOUNCE_COOLDOWN,
+    ):
+        self.hass = hass
+        self.entity_id = entity_id
+        self._send = send
+        self._confirmed = confirmed
+        self._pending: Optional[float] = None
+        self._priority = PRIORITY_MANUAL
+        self._debouncer = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=cooldown,
+            immediate=False,
+            function=self._async_write,
+        )
+
+    @property
+    def pending(self) -> Optional[float]:
+        """Return the setpoint waiting to be written, if any."""
+        return self._pending
+
+    async def async_request(self, temperature: float, priority: int = PRIORITY_MANUAL) -> None:
+        """Queue a setpoint, replacing any value not yet written."""
+        self._pending = temperature
+        self._priority = priority
+        await self._debouncer.async_call()
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Drop the pending setpoint and cancel the debounce timer."""
+        self._pending = None
+        self._debouncer.async_cancel()
+
+    async def _async_write(self) -> None:
+        temperature, self._pending = self._pending, None
+        if temperature is None:
+            return
+        if temperature == self._confirmed():
+            _LOGGER.debug(
+                "Skipping setpoint %s for %s, already confirmed", temperature, self.entity_id
+            )
+            return
+        await self._send(temperature, self._priority)
+
+
+@dataclass(slots=True)
+class _Command:
+    entity_id: str
+    priority: int
+    send: Callable[[], Awaitable[None]]
+    queued_at: float
+
+
+class SetpointDispatcher:
+    """Integration-wide limiter for setpoint commands to the Z-Wave mesh.
+
+    At most ``max_concurrent`` commands run at once; the rest wait in a heap
+    ordered by priority, so manual changes overtake scheduled ones. Each
+    thermostat holds at most one queued command, a newer one replacing it.
+    Schedule-driven commands are first delayed by a random jitter so
+    thermostats sharing a schedule boundary do not all queue at once.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT_COMMANDS,
+        schedule_jitter: float = DEFAULT_SCHEDULE_JITTER,
+    ):
+        self.hass = hass
+        self._max_concurrent = max(1, max_concurrent)
+        self._schedule_jitter = schedule_jitter
+        self._heap: List[Tuple[int, int, _Command]] = []
+        self._queued: Dict[str, _Command] = {}
+        self._delayed: Dict[str, CALLBACK_TYPE] = {}
+        self._counter = itertools.count()
+        self._in_flight = 0
+        # Metrics
+        self._dispatched = 0
+        self._failed = 0
+        self._max_queue_depth = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._last_wait: Optional[float] = None
+
+    @callback
+    def async_submit(
+        self, entity_id: str, priority: int, send: Callable[[], Awaitable[None]]
+    ) -> None:
+        """Queue a command for entity_id, replacing any not yet started."""
+        if unsub := self._delayed.pop(entity_id, None):
+            unsub()
+        if priority == PRIORITY_SCHEDULE and self._schedule_jitter > 0:
+            delay = random.uniform(0, self._schedule_jitter)
+
+            @callback
+            def _enqueue_later(_now) -> None:
+                self._delayed.pop(entity_id, None)
+                self._enqueue(entity_id, priority, send)
+
+            self._delayed[entity_id] = async_call_later(self.hass, delay, _enqueue_later)
+            return
+        self._enqueue(entity_id, priority, send)
+
+    @callback
+    def async_cancel(self, entity_id: str) -> None:
+        """Drop entity_id's queued or delayed command; a running one finishes."""
+        if unsub := self._delayed.pop(entity_id, None):
+            unsub()
+        # Its heap item is skipped when popped
+        self._queued.pop(entity_id, None)
+
+    @callback
+    def async_update_options(self, max_concurrent: int, schedule_jitter: float) -> None:
+        """Apply new limits; commands already delayed keep their jitter."""
+        self._max_concurrent = max(1, max_concurrent)
+        self._schedule_jitter = schedule_jitter
+        self._pump()
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Drop queued and delayed commands; running ones finish on their own."""
+        for unsub in self._delayed.values():
+            unsub()
+        self._delayed.clear()
+        self._queued.clear()
+        self._heap.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Return queue depth and wait time statistics."""
+        return {
+            "queue_depth": len(self._queued),
+            "delayed": len(self._delayed),
+            "in_flight": self._in_flight,
+            "max_concurrent": self._max_concurrent,
+            "max_queue_depth": self._max_queue_depth,
+            "dispatched": self._dispatched,
+            "failed": self._failed,
+            "wait_avg": round(self._wait_total / self._dispatched, 3) if self._dispatched else None,
+            "wait_max": round(self._wait_max, 3),
+            "wait_last": round(self._last_wait, 3) if self._last_wait is not None else None,
+        }
+
+    def _enqueue(self, entity_id: str, priority: int, send: Callable[[], Awaitable[None]]) -> None:
+        command = _Command(entity_id, priority, send, time.monotonic())
+        # A replaced command stays in the heap and is skipped when popped
+        self._queued[entity_id] = command
+        heapq.heappush(self._heap, (priority, next(self._counter), command))
+        self._max_queue_depth = max(self._max_queue_depth, len(self._queued))
+        self._pump()
+
+    def _pump(self) -> None:
+        """Start queued commands while there is capacity."""
+        while self._in_flight < self._max_concurrent and self._heap:
+            _, _, command = heapq.heappop(self._heap)
+            if self._queued.get(command.entity_id) is not command:
+                continue
+            del self._queued[command.entity_id]
+            wait = time.monotonic() - command.queued_at
+            self._wait_total += wait
+            self._wait_max = max(self._wait_max, wait)
+            self._last_wait = wait
+            self._dispatched += 1
+            self._in_flight += 1
+            self.hass.async_create_task(self._async_run(command))
+
+    async def _async_run(self, command: _Command) -> None:
+        try:
+            await command.send()
+        except Exception as err:  # noqa: BLE001 - keep the queue moving
+            self._failed += 1
+            _LOGGER.warning("Setpoint command for %s failed: %s", command.entity_id, err)
+        finally:
+            self._in_flight -= 1
+            self._pump()
+
+
+@dataclass(slots=True)
+class _PendingAck:
+    temperature: float
+    resend: Callable[[], None]
+    requested_at: float
+    sent_at: Optional[float] = None
+    attempt: int = 0
+    unsub_timeout: Optional[CALLBACK_TYPE] = None
+
+
+@dataclass(slots=True)
+class _AckStats:
+    acked: int = 0
+    failed: int = 0
+    retries: int = 0
+    latency_total: float = 0.0
+    latency_max: float = 0.0
+    latency_last: Optional[float] = None
+
+
+class SetpointAckTracker:
+    """Confirm that sent setpoints are applied by the Z-Wave entity.
+
+    A setpoint is expected once it is queued and its timeout starts when
+    the command is actually sent. The entity's reported ``temperature``
+    attribute acknowledges it; otherwise it is resent with exponential
+    backoff up to ``max_retries`` times and then counted as failed. Only
+    the latest setpoint per entity is tracked.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        timeout: float = SETPOINT_ACK_TIMEOUT,
+        max_retries: int = SETPOINT_MAX_RETRIES,
+    ):
+        self.hass = hass
+        self._timeout = timeout
+        self._max_retries = max_retries
+        self._pending: Dict[str, _PendingAck] = {}
+        self._stats: Dict[str, _AckStats] = {}
+
+    @callback
+    def async_expect(
+        self, entity_id: str, temperature: float, resend: Callable[[], None]
+    ) -> None:
+        """Start tracking a setpoint for entity_id, replacing an older one.
+
+        A setpoint the entity already reports is acknowledged right away,
+        since no later state change would confirm it.
+        """
+        self.async_cancel(entity_id)
+        self._pending[entity_id] = _PendingAck(temperature, resend, time.monotonic())
+        if (state := self.hass.states.get(entity_id)) is None:
+            return
+        try:
+            reported = float(state.attributes[ATTR_TEMPERATURE])
+        except (KeyError, TypeError, ValueError):
+            return
+        self.async_observe(entity_id, reported)
+
+    @callback
+    def async_sent(self, entity_id: str) -> None:
+        """Start the acknowledgement timeout once the command has gone out."""
+        pending = self._pending.get(entity_id)
+        if pending is None:
+            return
+        if pending.sent_at is None:
+            pending.sent_at = time.monotonic()
+        if pending.unsub_timeout:
+            pending.unsub_timeout()
+
+        @callback
+        def _expired(_now) -> None:
+            self._async_timeout(entity_id, pending)
+
+        pending.unsub_timeout = async_call_later(
+            self.hass, self._timeout * 2 ** pending.attempt, _expired
+        )
+
+    @callback
+    def async_observe(self, entity_id: str, temperature: Optional[float]) -> None:
+        """Feed the setpoint the entity reports; acknowledges a match."""
+        pending = self._pending.get(entity_id)
+        if pending is None or temperature is None:
+            return
+        if abs(temperature - pending.temperature) > SETPOINT_ACK_TOLERANCE:
+            return
+        self.async_cancel(entity_id)
+        stats = self._stats.setdefault(entity_id, _AckStats())
+        latency = time.monotonic() - (pending.sent_at or pending.requested_at)
+        stats.acked += 1
+        stats.latency_total += latency
+        stats.latency_max = max(stats.latency_max, latency)
+        stats.latency_last = latency
+        _LOGGER.debug(
+            "Setpoint %s acknowledged by %s after %.1fs (%d retries)",
+            pending.temperature, entity_id, latency, pending.attempt,
+        )
+
+    @callback
+    def async_cancel(self, entity_id: str) -> None:
+        """Stop tracking entity_id's current setpoint."""
+        pending = self._pending.pop(entity_id, None)
+        if pending and pending.unsub_timeout:
+            pending.unsub_timeout()
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel every outstanding timeout."""
+        for entity_id in list(self._pending):
+            self.async_cancel(entity_id)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Return per-entity acknowledgement latency and failure counts."""
+        return {
+            entity_id: {
+                "acked": stats.acked,
+                "failed": stats.failed,
+                "retries": stats.retries,
+                "pending": entity_id in self._pending,
+                "latency_avg": round(stats.latency_total / stats.acked, 3) if stats.acked else None,
+                "latency_max": round(stats.latency_max, 3),
+                "latency_last": (
+                    round(stats.latency_last, 3) if stats.latency_last is not None else None
+                ),
+            }
+            for entity_id, stats in self._stats.items()
+        }
+
+    @callback
+    def _async_timeout(self, entity_id: str, pending: _PendingAck) -> None:
+        if self._pending.get(entity_id) is not pending:
+            return
+        pending.unsub_timeout = None
+        stats = self._stats.setdefault(entity_id, _AckStats())
+        if pending.attempt >= self._max_retries:
+            del self._pending[entity_id]
+            stats.failed += 1
+            _LOGGER.warning(
+                "%s did not confirm setpoint %s after %d retries",
+                entity_id, pending.temperature, pending.attempt,
+            )
+            return
+        pending.attempt += 1
+        stats.retries += 1
+        _LOGGER.info(
+            "Resending setpoint %s to %s (retry %d of %d)",
+            pending.temperature, entity_id, pending.attempt, self._max_retries,
+        )
+        pending.resend()
@@ -12,25 +12,80 @@ from homeassistant.helpers.selector import (
     NumberSelector,
     NumberSelectorConfig,
     NumberSelectorMode,
+    SelectOptionDict,
+    SelectSelector,
+    SelectSelectorConfig,
 )
 from homeassistant.const import Platform
 
+from . import entry_thermostats
 from .const import (
     DOMAIN,
+    ZWAVE_JS_DOMAIN,
+    CONF_THERMOSTATS,
     CONF_SELECTED_CLIMATE_ENTITY,
     CONF_SAFETY_MIN_TEMP,
     CONF_SAFETY_MAX_TEMP,
     CONF_HOME_TEMP,
     CONF_AWAY_TEMP,
+    CONF_SAVE_DELAY,
+    CONF_MAX_CONCURRENT_COMMANDS,
+    CONF_SCHEDULE_JITTER,
     DEFAULT_SAFETY_MIN_TEMP,
     DEFAULT_SAFETY_MAX_TEMP,
     DEFAULT_HOME_TEMP,
     DEFAULT_AWAY_TEMP,
+    DEFAULT_SAVE_DELAY,
+    DEFAULT_MAX_CONCURRENT_COMMANDS,
+    DEFAULT_SCHEDULE_JITTER,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _temperature_fields(values=None):
+    """Return the per-thermostat temperature fields, defaulting to values."""
+    values = values or {}
+    return {
+        vol.Optional(CONF_SAFETY_MIN_TEMP, default=values.get(CONF_SAFETY_MIN_TEMP, DEFAULT_SAFETY_MIN_TEMP)): NumberSelector(
+            NumberSelectorConfig(
+                min=32,
+                max=80,
+                step=1,
+                mode=NumberSelectorMode.BOX,
+                unit_of_measurement="°F"
+            )
+        ),
+        vol.Optional(CONF_SAFETY_MAX_TEMP, default=values.get(CONF_SAFETY_MAX_TEMP, DEFAULT_SAFETY_MAX_TEMP)): NumberSelector(
+            NumberSelectorConfig(
+                min=60,
+                max=100,
+                step=1,
+                mode=NumberSelectorMode.BOX,
+                unit_of_measurement="°F"
+            )
+        ),
+        vol.Optional(CONF_HOME_TEMP, default=values.get(CONF_HOME_TEMP, DEFAULT_HOME_TEMP)): NumberSelector(
+            NumberSelectorConfig(
+                min=50,
+                max=85,
+                step=1,
+                mode=NumberSelectorMode.BOX,
+                unit_of_measurement="°F"
+            )
+        ),
+        vol.Optional(CONF_AWAY_TEMP, default=values.get(CONF_AWAY_TEMP, DEFAULT_AWAY_TEMP)): NumberSelector(
+            NumberSelectorConfig(
+                min=50,
+                max=85,
+                step=1,
+                mode=NumberSelectorMode.BOX,
+                unit_of_measurement="°F"
+            )
+        ),
+    }
+
+
 class EnhancedZWaveThermostatConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Enhanced Z-Wave Thermostat."""
 
@@ -40,9 +95,59 @@ class EnhancedZWaveThermostatConfigFlow(config_entries.ConfigFlow, domain=DOMAIN
         """Initialize the config flow."""
         super().__init__()
         self._climate_entities = []
+        # Unwrapped zwave_js climate entities, found in the same registry pass
+        self._discovered = {}
+        self._scanned = False
 
     async def async_step_user(self, user_input=None) -> FlowResult:
-        """Handle the initial step."""
+        """Choose between wrapping one thermostat or a set of them."""
+        return self.async_show_menu(
+            step_id="user",
+            menu_options=["discover", "thermostat", "thermostats"],
+        )
+
+    async def async_step_discover(self, user_input=None) -> FlowResult:
+        """Offer every zwave_js thermostat that is not wrapped yet.
+
+        All discovered entities are preselected and the chosen ones are
+        created together as one multi-thermostat entry.
+        """
+        await self._get_climate_entities()
+
+        if not self._discovered:
+            return self.async_abort(reason="no_new_thermostats")
+
+        if user_input is not None:
+            errors = self._validate_thermostats(user_input)
+            if not errors:
+                return self._create_multi_entry(user_input)
+        else:
+            errors = {}
+
+        data_schema = vol.Schema({
+            vol.Required(CONF_THERMOSTATS, default=list(self._discovered)): SelectSelector(
+                SelectSelectorConfig(
+                    options=[
+                        SelectOptionDict(value=entity_id, label=label)
+                        for entity_id, label in self._discovered.items()
+                    ],
+                    multiple=True,
+                )
+            ),
+            **_temperature_fields(),
+        })
+
+        return self.async_show_form(
+            step_id="discover",
+            data_schema=data_schema,
+            errors=errors,
+            description_placeholders={
+                "entity_count": str(len(self._discovered))
+            }
+        )
+
+    async def async_step_thermostat(self, user_input=None) -> FlowResult:
+        """Wrap a single climate entity in its own entry."""
         errors = {}
         
         # Get available climate entities
@@ -116,7 +221,44 @@ class EnhancedZWaveThermostatConfigFlow(config_entries.ConfigFlow, domain=DOMAIN
         data_schema = self._create_data_schema()
 
         return self.async_show_form(
-            step_id="user",
+            step_id="thermostat",
+            data_schema=data_schema,
+            errors=errors,
+            description_placeholders={
+                "entity_count": str(len(self._climate_entities))
+            }
+        )
+
+    async def async_step_thermostats(self, user_input=None) -> FlowResult:
+        """Wrap several climate entities in one multi-thermostat entry.
+
+        The safety, home and away values entered here are the starting point
+        for every thermostat; each can be adjusted later in the options.
+        """
+        errors = {}
+
+        await self._get_climate_entities()
+
+        if user_input is not None:
+            errors = self._validate_thermostats(user_input)
+            if not errors:
+                return self._create_multi_entry(user_input)
+
+        if not self._climate_entities:
+            errors["base"] = "no_climate_entities"
+
+        data_schema = vol.Schema({
+            vol.Required(CONF_THERMOSTATS): EntitySelector(
+                EntitySelectorConfig(
+                    domain=Platform.CLIMATE,
+                    multiple=True,
+                )
+            ),
+            **_temperature_fields(),
+        })
+
+        return self.async_show_form(
+            step_id="thermostats",
             data_schema=data_schema,
             errors=errors,
             description_placeholders={
@@ -124,16 +266,78 @@ class EnhancedZWaveThermostatConfigFlow(config_entries.ConfigFlow, domain=DOMAIN
             }
         )
 
+    def _validate_thermostats(self, user_input) -> dict:
+        """Check the entities and temperatures for a multi-thermostat entry."""
+        selected_entities = user_input.get(CONF_THERMOSTATS) or []
+        min_temp = user_input.get(CONF_SAFETY_MIN_TEMP, DEFAULT_SAFETY_MIN_TEMP)
+        max_temp = user_input.get(CONF_SAFETY_MAX_TEMP, DEFAULT_SAFETY_MAX_TEMP)
+
+        if not selected_entities:
+            return {"base": "no_entity_selected"}
+        if min_temp >= max_temp:
+            return {"base": "invalid_temp_range"}
+
+        entity_registry = er.async_get(self.hass)
+        configured = self._configured_entities()
+        for entity_id in selected_entities:
+            entity_entry = entity_registry.async_get(entity_id)
+            if not entity_entry:
+                return {"base": "entity_not_found"}
+            if entity_entry.domain != "climate":
+                return {"base": "invalid_entity_type"}
+            if entity_id in configured:
+                _LOGGER.warning(
+                    "Entity %s is already configured in %s",
+                    entity_id, ", ".join(configured[entity_id]),
+                )
+                return {"base": "entity_already_configured"}
+        return {}
+
+    def _create_multi_entry(self, user_input) -> FlowResult:
+        """Create one entry managing every selected thermostat."""
+        defaults = {
+            key: value
+            for key, value in user_input.items()
+            if key != CONF_THERMOSTATS
+        }
+        thermostats = [
+            {CONF_SELECTED_CLIMATE_ENTITY: entity_id, **defaults}
+            for entity_id in user_input[CONF_THERMOSTATS]
+        ]
+        _LOGGER.info(
+            "Creating multi-thermostat config entry for %d entities", len(thermostats)
+        )
+        return self.async_create_entry(
+            title=f"Enhanced Z-Wave Thermostats ({len(thermostats)})",
+            data={CONF_THERMOSTATS: thermostats},
+        )
+
     async def _get_climate_entities(self):
-        """Get all available climate entities."""
+        """Get all available climate entities.
+
+        The registry is scanned once per flow; the same pass collects the
+        zwave_js thermostats that are not wrapped yet for discovery.
+        """
+        if self._scanned:
+            return
         try:
             entity_registry = er.async_get(self.hass)
-            self._climate_entities = [
-                entry for entry in entity_registry.entities.values()
-                if entry.domain == Platform.CLIMATE.value
-                and not entry.disabled_by
-                and not entry.hidden_by
-            ]
+            configured = self._configured_entities()
+            self._climate_entities = []
+            self._discovered = {}
+            for entry in entity_registry.entities.values():
+                if (
+                    entry.domain != Platform.CLIMATE.value
+                    or entry.disabled_by
+                    or entry.hidden_by
+                ):
+                    continue
+                self._climate_entities.append(entry)
+                if entry.platform == ZWAVE_JS_DOMAIN and entry.entity_id not in configured:
+                    self._discovered[entry.entity_id] = (
+                        entry.name or entry.original_name or entry.entity_id
+                    )
+            self._scanned = True
             
             _LOGGER.debug("Registry scan complete. Found entities: %s", 
                          [(e.entity_id, e.name, e.platform) for e in self._climate_entities])
@@ -141,20 +345,26 @@ class EnhancedZWaveThermostatConfigFlow(config_entries.ConfigFlow, domain=DOMAIN
         except Exception as err:
             _LOGGER.error("Error getting climate entities: %s", err, exc_info=True)
             self._climate_entities = []
+            self._discovered = {}
+
+    def _configured_entities(self) -> dict:
+        """Map each already wrapped climate entity to the titles of its entries."""
+        configured = {}
+        for entry in self._async_current_entries():
+            for thermostat in entry_thermostats(entry):
+                configured.setdefault(
+                    thermostat.get(CONF_SELECTED_CLIMATE_ENTITY), []
+                ).append(entry.title)
+        return configured
 
     async def _check_existing_entries(self, entity_id: str, errors: dict):
         """Check if entity is already configured."""
-        existing_entries = []
-        for entry in self._async_current_entries():
-            configured_entity = entry.data.get(CONF_SELECTED_CLIMATE_ENTITY)
-            if configured_entity == entity_id:
-                existing_entries.append(entry)
+        entry_titles = self._configured_entities().get(entity_id)
                 
-        if existing_entries:
+        if entry_titles:
             errors["base"] = "entity_already_configured"
-            entry_titles = [entry.title for entry in existing_entries]
             _LOGGER.warning("Entity %s is already configured in %d entries: %s", 
-                          entity_id, len(existing_entries), entry_titles)
+                          entity_id, len(entry_titles), entry_titles)
             # Add context to help user understand which entries to remove
             errors["entity_already_configured_details"] = f"Remove existing entries: {', '.join(entry_titles)}"
 
@@ -167,42 +377,7 @@ class EnhancedZWaveThermostatConfigFlow(config_entries.ConfigFlow, domain=DOMAIN
                     multiple=False,
                 )
             ),
-            vol.Optional(CONF_SAFETY_MIN_TEMP, default=DEFAULT_SAFETY_MIN_TEMP): NumberSelector(
-                NumberSelectorConfig(
-                    min=32,
-                    max=80,
-                    step=1,
-                    mode=NumberSelectorMode.BOX,
-                    unit_of_measurement="°F"
-                )
-            ),
-            vol.Optional(CONF_SAFETY_MAX_TEMP, default=DEFAULT_SAFETY_MAX_TEMP): NumberSelector(
-                NumberSelectorConfig(
-                    min=60,
-                    max=100,
-                    step=1,
-                    mode=NumberSelectorMode.BOX,
-                    unit_of_measurement="°F"
-                )
-            ),
-            vol.Optional(CONF_HOME_TEMP, default=DEFAULT_HOME_TEMP): NumberSelector(
-                NumberSelectorConfig(
-                    min=50,
-                    max=85,
-                    step=1,
-                    mode=NumberSelectorMode.BOX,
-                    unit_of_measurement="°F"
-                )
-            ),
-            vol.Optional(CONF_AWAY_TEMP, default=DEFAULT_AWAY_TEMP): NumberSelector(
-                NumberSelectorConfig(
-                    min=50,
-                    max=85,
-                    step=1,
-                    mode=NumberSelectorMode.BOX,
-                    unit_of_measurement="°F"
-                )
-            ),
+            **_temperature_fields(),
         })
 
     @staticmethod
@@ -213,14 +388,50 @@ class EnhancedZWaveThermostatConfigFlow(config_entries.ConfigFlow, domain=DOMAIN
 
 
 class EnhancedZWaveThermostatOptionsFlow(config_entries.OptionsFlow):
-    """Handle options flow for Enhanced Z-Wave Thermostat."""
+    """Handle options flow for Enhanced Z-Wave Thermostat.
+
+    Single-thermostat entries get one form. Multi-thermostat entries get a
+    menu to change the shared settings and to add, edit or remove the
+    thermostats they manage; the thermostat list is stored in the options.
+    """
 
     def __init__(self, config_entry):
         """Initialize options flow."""
         self._config_entry = config_entry
+        self._thermostats = entry_thermostats(config_entry)
+        self._edit_entity = None
+
+    @property
+    def _is_multi(self) -> bool:
+        return (
+            CONF_THERMOSTATS in self._config_entry.data
+            or CONF_THERMOSTATS in self._config_entry.options
+        )
+
+    def _save(self, **changes) -> FlowResult:
+        """Store changes alongside the existing options and thermostat list."""
+        return self.async_create_entry(
+            title="",
+            data={
+                **self._config_entry.options,
+                CONF_THERMOSTATS: self._thermostats,
+                **changes,
+            },
+        )
 
     async def async_step_init(self, user_input=None) -> FlowResult:
         """Manage the options."""
+        if self._is_multi:
+            return self.async_show_menu(
+                step_id="init",
+                menu_options=[
+                    "settings",
+                    "add_thermostats",
+                    "edit_thermostat",
+                    "remove_thermostats",
+                ],
+            )
+
         if user_input is not None:
             return self.async_create_entry(title="", data=user_input)
 
@@ -237,9 +448,173 @@ class EnhancedZWaveThermostatOptionsFlow(config_entries.OptionsFlow):
                     CONF_SAFETY_MAX_TEMP, DEFAULT_SAFETY_MAX_TEMP
                 )
             ): vol.All(vol.Coerce(int), vol.Range(min=60, max=100)),
+            **self._shared_fields(),
         })
 
         return self.async_show_form(
             step_id="init",
             data_schema=data_schema,
-        )
\ No newline at end of file
+        )
+
+    def _shared_fields(self):
+        """Return the fields that apply to the whole integration."""
+        return {
+            vol.Optional(
+                CONF_SAVE_DELAY,
+                default=self._config_entry.options.get(
+                    CONF_SAVE_DELAY, DEFAULT_SAVE_DELAY
+                )
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=300)),
+            vol.Optional(
+                CONF_MAX_CONCURRENT_COMMANDS,
+                default=self._config_entry.options.get(
+                    CONF_MAX_CONCURRENT_COMMANDS, DEFAULT_MAX_CONCURRENT_COMMANDS
+                )
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=10)),
+            vol.Optional(
+                CONF_SCHEDULE_JITTER,
+                default=self._config_entry.options.get(
+                    CONF_SCHEDULE_JITTER, DEFAULT_SCHEDULE_JITTER
+                )
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=300)),
+        }
+
+    async def async_step_settings(self, user_input=None) -> FlowResult:
+        """Change the settings shared by every thermostat."""
+        if user_input is not None:
+            return self._save(**user_input)
+
+        return self.async_show_form(
+            step_id="settings",
+            data_schema=vol.Schema(self._shared_fields()),
+        )
+
+    async def async_step_add_thermostats(self, user_input=None) -> FlowResult:
+        """Add climate entities to this entry."""
+        errors = {}
+
+        if user_input is not None:
+            managed = {
+                thermostat[CONF_SELECTED_CLIMATE_ENTITY] for thermostat in self._thermostats
+            }
+            configured = {
+                thermostat.get(CONF_SELECTED_CLIMATE_ENTITY)
+                for entry in self.hass.config_entries.async_entries(DOMAIN)
+                if entry.entry_id != self._config_entry.entry_id
+                for thermostat in entry_thermostats(entry)
+            }
+            selected_entities = [
+                entity_id
+                for entity_id in user_input.get(CONF_THERMOSTATS) or []
+                if entity_id not in managed
+            ]
+            if any(entity_id in configured for entity_id in selected_entities):
+                errors["base"] = "entity_already_configured"
+            elif user_input.get(CONF_SAFETY_MIN_TEMP, DEFAULT_SAFETY_MIN_TEMP) >= user_input.get(
+                CONF_SAFETY_MAX_TEMP, DEFAULT_SAFETY_MAX_TEMP
+            ):
+                errors["base"] = "invalid_temp_range"
+            else:
+                defaults = {
+                    key: value
+                    for key, value in user_input.items()
+                    if key != CONF_THERMOSTATS
+                }
+                self._thermostats = self._thermostats + [
+                    {CONF_SELECTED_CLIMATE_ENTITY: entity_id, **defaults}
+                    for entity_id in selected_entities
+                ]
+                return self._save()
+
+        return self.async_show_form(
+            step_id="add_thermostats",
+            data_schema=vol.Schema({
+                vol.Required(CONF_THERMOSTATS): EntitySelector(
+                    EntitySelectorConfig(
+                        domain=Platform.CLIMATE,
+                        multiple=True,
+                    )
+                ),
+                **_temperature_fields(),
+            }),
+            errors=errors,
+        )
+
+    async def async_step_edit_thermostat(self, user_input=None) -> FlowResult:
+        """Pick the thermostat whose temperatures to change."""
+        if user_input is not None:
+            self._edit_entity = user_input[CONF_SELECTED_CLIMATE_ENTITY]
+            return await self.async_step_thermostat_settings()
+
+        return self.async_show_form(
+            step_id="edit_thermostat",
+            data_schema=vol.Schema({
+                vol.Required(CONF_SELECTED_CLIMATE_ENTITY): SelectSelector(
+                    SelectSelectorConfig(options=self._managed_entities())
+                ),
+            }),
+        )
+
+    async def async_step_thermostat_settings(self, user_input=None) -> FlowResult:
+        """Change one thermostat's safety, home and away values."""
+        errors = {}
+        current = next(
+            (
+                thermostat
+                for thermostat in self._thermostats
+                if thermostat[CONF_SELECTED_CLIMATE_ENTITY] == self._edit_entity
+            ),
+            {},
+        )
+
+        if user_input is not None:
+            if user_input.get(CONF_SAFETY_MIN_TEMP, DEFAULT_SAFETY_MIN_TEMP) >= user_input.get(
+                CONF_SAFETY_MAX_TEMP, DEFAULT_SAFETY_MAX_TEMP
+            ):
+                errors["base"] = "invalid_temp_range"
+            else:
+                self._thermostats = [
+                    {**thermostat, **user_input}
+                    if thermostat is current
+                    else thermostat
+                    for thermostat in self._thermostats
+                ]
+                return self._save()
+
+        return self.async_show_form(
+            step_id="thermostat_settings",
+            data_schema=vol.Schema(_temperature_fields(current)),
+            errors=errors,
+            description_placeholders={"entity_id": self._edit_entity or ""},
+        )
+
+    async def async_step_remove_thermostats(self, user_input=None) -> FlowResult:
+        """Stop managing some of this entry's thermostats."""
+        if user_input is not None:
+            removed = set(user_input.get(CONF_THERMOSTATS) or [])
+            # Drop the wrappers from the registry so they don't linger as unavailable
+            entity_registry = er.async_get(self.hass)
+            for entity_id in removed:
+                wrapper_id = entity_registry.async_get_entity_id(
+                    Platform.CLIMATE, DOMAIN, f"enhanced_{entity_id.replace('.', '_')}"
+                )
+                if wrapper_id:
+                    entity_registry.async_remove(wrapper_id)
+            self._thermostats = [
+                thermostat
+                for thermostat in self._thermostats
+                if thermostat[CONF_SELECTED_CLIMATE_ENTITY] not in removed
+            ]
+            return self._save()
+
+        return self.async_show_form(
+            step_id="remove_thermostats",
+            data_schema=vol.Schema({
+                vol.Optional(CONF_THERMOSTATS, default=[]): SelectSelector(
+                    SelectSelectorConfig(options=self._managed_entities(), multiple=True)
+                ),
+            }),
+        )
+
+    def _managed_entities(self):
+        return [thermostat[CONF_SELECTED_CLIMATE_ENTITY] for thermostat in self._thermostats]
@@ -3,6 +3,9 @@
 DOMAIN = "enhanced_zwave_thermostat"
 NAME = "Enhanced Z-Wave Thermostat"
 
+# Integration whose climate entities are wrapped
+ZWAVE_JS_DOMAIN = "zwave_js"
+
 # Configuration constants
 CONF_THERMOSTATS = "thermostats"
 CONF_SELECTED_CLIMATE_ENTITY = "selected_climate_entity"
@@ -11,12 +14,18 @@ CONF_SAFETY_MAX_TEMP = "safety_max_temp"
 CONF_HOME_TEMP = "home_temp"
 CONF_AWAY_TEMP = "away_temp"
 CONF_SCHEDULE_ENABLED = "schedule_enabled"
+CONF_SAVE_DELAY = "save_delay"
+CONF_MAX_CONCURRENT_COMMANDS = "max_concurrent_commands"
+CONF_SCHEDULE_JITTER = "schedule_jitter"
 
 # Default values
 DEFAULT_SAFETY_MIN_TEMP = 40  # Fahrenheit
 DEFAULT_SAFETY_MAX_TEMP = 90  # Fahrenheit
 DEFAULT_HOME_TEMP = 72
 DEFAULT_AWAY_TEMP = 65
+DEFAULT_SAVE_DELAY = 10  # Seconds to coalesce schedule writes
+DEFAULT_MAX_CONCURRENT_COMMANDS = 2  # Setpoint commands in flight across the mesh
+DEFAULT_SCHEDULE_JITTER = 10  # Max seconds to spread schedule-driven writes over
 
 # Services
 SERVICE_SET_SCHEDULE = "set_schedule"
@@ -29,18 +38,29 @@ SERVICE_DELETE_SCHEDULE = "delete_schedule"
 SERVICE_TOGGLE_SCHEDULE = "toggle_schedule"
 SERVICE_SET_HOLD = "set_hold"
 SERVICE_CLEAR_HOLD = "clear_hold"
+SERVICE_REPLACE_PROGRAM = "replace_program"
+SERVICE_EXPORT_SCHEDULES = "export_schedules"
+SERVICE_IMPORT_SCHEDULES = "import_schedules"
+SERVICE_SET_PROFILE = "set_profile"
+SERVICE_DELETE_PROFILE = "delete_profile"
+SERVICE_ASSIGN_PROFILE = "assign_profile"
 
 # Events
 EVENT_SCHEDULE_UPDATED = f"{DOMAIN}_schedule_updated"
 EVENT_NEXT_SETPOINT = f"{DOMAIN}_next_setpoint"
 EVENT_HOLD_CHANGED = f"{DOMAIN}_hold_changed"
+EVENT_SAFETY_OVERRIDE_CHANGED = f"{DOMAIN}_safety_override_changed"
+
+# Dispatcher signals, formatted with the thermostat entity_id
+SIGNAL_SCHEDULE_DUE = f"{DOMAIN}_schedule_due_{{}}"
+SIGNAL_SCHEDULE_CHANGED = f"{DOMAIN}_schedule_changed_{{}}"
 
 # Attributes
 ATTR_SCHEDULE = "schedule"
 ATTR_HOME_AWAY_MODE = "home_away_mode"
 ATTR_SAFETY_OVERRIDE = "safety_override"
+ATTR_SAFETY_OVERRIDE_UNTIL = "safety_override_until"
 ATTR_ZONE_ID = "zone_id"
-ATTR_ENHANCED_SCHEDULES = "enhanced_schedules"
 ATTR_NEXT_SETPOINT_TIME = "enhanced_next_setpoint_time"
 ATTR_NEXT_SETPOINT_TEMP = "enhanced_next_setpoint_temp"
 ATTR_SCHEDULES_COUNT = "enhanced_schedules_count"
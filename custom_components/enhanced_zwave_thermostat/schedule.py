@@ -0,0 +1,197 @@
+"""Schedule records and evaluation helpers for Enhanced Z-Wave Thermostat.
+
+Schedules are held in memory as compact ScheduleEntry records and compiled
+into a sorted minute-of-week timeline so that the current and next setpoint
+can be found with a bisect instead of re-parsing every schedule on each
+lookup. The dict format is only used at the service and storage boundary.
+"""
+from __future__ import annotations
+
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from homeassistant.util import dt as dt_util
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+WEEKDAYS = (
+    "monday",
+    "tuesday",
+    "wednesday",
+    "thursday",
+    "friday",
+    "saturday",
+    "sunday",
+)
+_WEEKDAY_INDEX = {name: index for index, name in enumerate(WEEKDAYS)}
+_WEEKDAY_INDEX.update({name[:3]: index for index, name in enumerate(WEEKDAYS)})
+
+
+def parse_time(value: str) -> int:
+    """Parse an "HH:MM" string into minutes after midnight.
+
+    Raises ValueError for anything that is not a valid 24h time.
+    """
+    parts = str(value).split(":")
+    if len(parts) != 2:
+        raise ValueError(f"Invalid time format '{value}'. Use HH:MM format.")
+    hours, minutes = int(parts[0]), int(parts[1])
+    if not (0 <= hours <= 23 and 0 <= minutes <= 59):
+        raise ValueError(f"Invalid time values '{value}'")
+    return hours * 60 + minutes
+
+
+def parse_weekdays(values: Iterable[str], strict: bool = False) -> List[int]:
+    """Return weekday indexes (Monday=0) for names like "monday" or "mon".
+
+    Unknown names are ignored, or raise ValueError when strict is set.
+    """
+    indexes = []
+    for value in values or []:
+        index = _WEEKDAY_INDEX.get(str(value).strip().lower())
+        if index is None:
+            if strict:
+                raise ValueError(f"Unknown weekday '{value}'")
+        elif index not in indexes:
+            indexes.append(index)
+    return indexes
+
+
+def weekday_mask(values: Iterable[str], strict: bool = False) -> int:
+    """Return a 7-bit mask (bit 0 = Monday) for a list of weekday names."""
+    mask = 0
+    for index in parse_weekdays(values, strict):
+        mask |= 1 << index
+    return mask
+
+
+def format_time(minute: int) -> str:
+    """Format minutes after midnight as "HH:MM"."""
+    return f"{minute // 60:02d}:{minute % 60:02d}"
+
+
+def _to_timestamp(value: Any) -> Optional[float]:
+    if not value:
+        return None
+    parsed = dt_util.parse_datetime(str(value))
+    return parsed.timestamp() if parsed else None
+
+
+def _to_iso(timestamp: Optional[float]) -> Optional[str]:
+    if timestamp is None:
+        return None
+    return dt_util.as_local(dt_util.utc_from_timestamp(timestamp)).isoformat()
+
+
+@dataclass(slots=True, frozen=True)
+class ScheduleEntry:
+    """One schedule slot: a setpoint applied at a time on a set of weekdays.
+
+    Entries are immutable; edits create a new entry with dataclasses.replace.
+    """
+
+    id: str
+    weekday_mask: int
+    minute: int
+    temperature: float
+    name: str
+    enabled: bool = True
+    created: Optional[float] = None
+    updated: Optional[float] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ScheduleEntry":
+        """Build an entry from the service/storage dict format.
+
+        Raises ValueError (or KeyError for missing fields) on invalid input.
+        """
+        return cls(
+            id=str(data["id"]),
+            weekday_mask=weekday_mask(data.get("weekdays", [])),
+            minute=parse_time(data["time"]),
+            temperature=float(data["temperature"]),
+            name=data.get("name") or "",
+            enabled=bool(data.get("enabled", True)),
+            created=_to_timestamp(data.get("created")),
+            updated=_to_timestamp(data.get("updated")),
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the service/storage dict representation."""
+        data: Dict[str, Any] = {
+            "id": self.id,
+            "weekdays": [
+                name for index, name in enumerate(WEEKDAYS) if self.weekday_mask & (1 << index)
+            ],
+            "time": format_time(self.minute),
+            "temperature": self.temperature,
+            "name": self.name,
+            "enabled": self.enabled,
+            "created": _to_iso(self.created),
+        }
+        if self.updated is not None:
+            data["updated"] = _to_iso(self.updated)
+        return data
+
+
+def minute_of_week(now: datetime) -> int:
+    """Return the minute of the week (Monday 00:00 = 0) for a datetime."""
+    return now.weekday() * MINUTES_PER_DAY + now.hour * 60 + now.minute
+
+
+def week_start(now: datetime) -> datetime:
+    """Return midnight on the Monday of the week containing ``now``."""
+    return (now - timedelta(days=now.weekday())).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+
+
+class ScheduleTimeline:
+    """Sorted minute-of-week transitions compiled from a schedule list.
+
+    Only enabled schedules with at least one weekday are included. Schedules
+    sharing the same minute keep their list order, so the later entry wins,
+    matching the previous linear scan.
+    """
+
+    __slots__ = ("_minutes", "_schedules")
+
+    def __init__(self, schedules: Iterable[ScheduleEntry]):
+        transitions: List[Tuple[int, ScheduleEntry]] = []
+        for sched in schedules:
+            if not sched.enabled:
+                continue
+            for day in range(7):
+                if sched.weekday_mask & (1 << day):
+                    transitions.append((day * MINUTES_PER_DAY + sched.minute, sched))
+        transitions.sort(key=lambda item: item[0])
+        self._minutes = [minute for minute, _ in transitions]
+        self._schedules = [sched for _, sched in transitions]
+
+    def __len__(self) -> int:
+        return len(self._minutes)
+
+    def current(self, now: datetime) -> Optional[ScheduleEntry]:
+        """Return the schedule whose transition most recently started.
+
+        Wraps around to the end of the previous week, so a Sunday evening
+        setpoint is still in effect early on Monday.
+        """
+        if not self._minutes:
+            return None
+        index = bisect_right(self._minutes, minute_of_week(now)) - 1
+        return self._schedules[index]
+
+    def next(self, now: datetime) -> Optional[Tuple[datetime, ScheduleEntry]]:
+        """Return the next transition strictly after ``now`` and its schedule."""
+        if not self._minutes:
+            return None
+        index = bisect_right(self._minutes, minute_of_week(now))
+        start = week_start(now)
+        if index == len(self._minutes):
+            index = 0
+            start += timedelta(days=7)
+        return start + timedelta(minutes=self._minutes[index]), self._schedules[index]
@@ -0,0 +1,108 @@
+"""Integration-wide transition scheduler for Enhanced Z-Wave Thermostat.
+
+All thermostats share one min-heap of (due time, key) and a single Home
+Assistant timer armed for the earliest entry, instead of one timer per
+entity.
+"""
+from __future__ import annotations
+
+import heapq
+import itertools
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+
+class TransitionScheduler:
+    """Min-heap of due times keyed by an identifier such as an entity_id.
+
+    Rescheduling a key pushes a new heap entry and leaves the old one in
+    place; stale entries are recognised by comparing against ``_due`` and
+    skipped when they reach the top.
+    """
+
+    def __init__(self, hass: HomeAssistant, on_due: Callable[[str], None]):
+        self.hass = hass
+        self._on_due = on_due
+        self._heap: List[Tuple[float, int, str]] = []
+        self._due: Dict[str, float] = {}
+        self._counter = itertools.count()
+        self._unsub_timer: Optional[CALLBACK_TYPE] = None
+        self._armed_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    @callback
+    def async_schedule(self, key: str, when: Optional[datetime]) -> None:
+        """Schedule (or reschedule) key for ``when``; None cancels it."""
+        if when is None:
+            self.async_cancel(key)
+            return
+        timestamp = when.timestamp()
+        if self._due.get(key) == timestamp:
+            return
+        self._due[key] = timestamp
+        heapq.heappush(self._heap, (timestamp, next(self._counter), key))
+        if len(self._heap) > 2 * len(self._due) + 16:
+            self._rebuild()
+        self._arm()
+
+    @callback
+    def async_cancel(self, key: str) -> None:
+        """Stop tracking key."""
+        if self._due.pop(key, None) is not None:
+            self._arm()
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel the timer and forget all entries."""
+        if self._unsub_timer:
+            self._unsub_timer()
+            self._unsub_timer = None
+        self._armed_at = None
+        self._heap.clear()
+        self._due.clear()
+
+    def _rebuild(self) -> None:
+        """Drop stale heap entries."""
+        self._heap = [
+            (timestamp, next(self._counter), key) for key, timestamp in self._due.items()
+        ]
+        heapq.heapify(self._heap)
+
+    def _arm(self) -> None:
+        """Point the single timer at the earliest live heap entry."""
+        while self._heap and self._due.get(self._heap[0][2]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        next_at = self._heap[0][0] if self._heap else None
+        if next_at == self._armed_at:
+            return
+        if self._unsub_timer:
+            self._unsub_timer()
+            self._unsub_timer = None
+        self._armed_at = next_at
+        if next_at is not None:
+            self._unsub_timer = async_track_point_in_utc_time(
+                self.hass, self._async_fire, dt_util.utc_from_timestamp(next_at)
+            )
+
+    @callback
+    def _async_fire(self, now: datetime) -> None:
+        """Dispatch every key that is due, then re-arm for the next one."""
+        self._unsub_timer = None
+        self._armed_at = None
+        now_ts = now.timestamp()
+        due_keys = []
+        while self._heap and self._heap[0][0] <= now_ts:
+            timestamp, _, key = heapq.heappop(self._heap)
+            if self._due.get(key) != timestamp:
+                continue
+            del self._due[key]
+            due_keys.append(key)
+        for key in due_keys:
+            self._on_due(key)
+        self._arm()
@@ -6,19 +6,30 @@ Initial simple schedule service expanded with:
  - Next setpoint calculation event
  - Central helpers for other modules (climate entity attributes)
 """
+import json
 import logging
-from datetime import datetime, time, timedelta
-from typing import Any, Dict, List, Optional
+from contextlib import contextmanager
+from dataclasses import replace
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 import uuid
 import voluptuous as vol
+import yaml
 
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
+from homeassistant.exceptions import HomeAssistantError, Unauthorized, UnknownUser
 from homeassistant.helpers import config_validation as cv, entity_registry as er
-from homeassistant.helpers.service import async_register_admin_service
-from homeassistant.helpers.storage import Store
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.service import (
+    async_extract_entity_ids,
+    async_register_admin_service,
+)
+from homeassistant.util import dt as dt_util
 
 from .const import (
     DOMAIN,
+    DEFAULT_SAVE_DELAY,
     SERVICE_SET_SCHEDULE,
     SERVICE_SET_HOME_AWAY,
     SERVICE_OVERRIDE_SAFETY,
@@ -29,233 +40,1079 @@ from .const import (
     SERVICE_TOGGLE_SCHEDULE,
     SERVICE_SET_HOLD,
     SERVICE_CLEAR_HOLD,
+    SERVICE_REPLACE_PROGRAM,
+    SERVICE_EXPORT_SCHEDULES,
+    SERVICE_SET_PROFILE,
+    SERVICE_DELETE_PROFILE,
+    SERVICE_ASSIGN_PROFILE,
+    SERVICE_IMPORT_SCHEDULES,
     ATTR_SCHEDULE,
     ATTR_HOME_AWAY_MODE,
     ATTR_ZONE_ID,
     EVENT_SCHEDULE_UPDATED,
     EVENT_NEXT_SETPOINT,
     EVENT_HOLD_CHANGED,
+    EVENT_SAFETY_OVERRIDE_CHANGED,
+    SIGNAL_SCHEDULE_CHANGED,
+    SIGNAL_SCHEDULE_DUE,
+)
+from .schedule import (
+    WEEKDAYS,
+    ScheduleEntry,
+    ScheduleTimeline,
+    format_time,
+    parse_time,
+    weekday_mask,
 )
+from .scheduler import TransitionScheduler
+from .storage import ScheduleStorage
 
 _LOGGER = logging.getLogger(__name__)
 
-STORAGE_VERSION = 2
-STORAGE_KEY = f"{DOMAIN}_schedules"
+# Every service registered by async_setup_services, removed again on unload
+SERVICES = (
+    SERVICE_SET_SCHEDULE,
+    SERVICE_SET_HOME_AWAY,
+    SERVICE_OVERRIDE_SAFETY,
+    SERVICE_GET_SCHEDULES,
+    SERVICE_UPDATE_SCHEDULE,
+    SERVICE_DELETE_SCHEDULE,
+    SERVICE_TOGGLE_SCHEDULE,
+    SERVICE_EXPORT_SCHEDULES,
+    SERVICE_IMPORT_SCHEDULES,
+    SERVICE_SET_PROFILE,
+    SERVICE_DELETE_PROFILE,
+    SERVICE_ASSIGN_PROFILE,
+    SERVICE_REPLACE_PROGRAM,
+    SERVICE_SET_HOLD,
+    SERVICE_CLEAR_HOLD,
+    SERVICE_DEBUG_INFO,
+)
+
+
+def _weekdays(value: List[str]) -> List[str]:
+    """Validate weekday names; a slot without a valid day would never fire."""
+    try:
+        if not weekday_mask(value, strict=True):
+            raise ValueError("At least one weekday is required")
+    except ValueError as err:
+        raise vol.Invalid(str(err)) from err
+    return value
+
 
 # Service schemas
-SET_SCHEDULE_SCHEMA = vol.Schema({
-    vol.Required("entity_id"): cv.entity_id,
+# Services accepting entity, area, floor and label targets
+SET_SCHEDULE_SCHEMA = cv.make_entity_service_schema({
     vol.Required(ATTR_SCHEDULE): vol.Schema({
-        vol.Required("weekdays"): vol.All(cv.ensure_list, [cv.string]),
+        vol.Required("weekdays"): vol.All(cv.ensure_list, [cv.string], _weekdays),
         vol.Required("time"): cv.string,  # Accept time as string format like "07:00"
         vol.Required("temperature"): vol.Coerce(float),
         vol.Optional("name"): cv.string,
     }),
+    vol.Optional("expected_version"): cv.string,
 })
 
-SET_HOME_AWAY_SCHEMA = vol.Schema({
-    vol.Required("entity_id"): cv.entity_id,
+SET_HOME_AWAY_SCHEMA = cv.make_entity_service_schema({
     vol.Required(ATTR_HOME_AWAY_MODE): vol.In(["home", "away"]),
 })
 
-OVERRIDE_SAFETY_SCHEMA = vol.Schema({
-    vol.Required("entity_id"): cv.entity_id,
+OVERRIDE_SAFETY_SCHEMA = cv.make_entity_service_schema({
     vol.Required("temperature"): vol.Coerce(float),
     vol.Optional("duration"): vol.Coerce(int),  # Minutes
 })
 
+GET_SCHEDULES_SCHEMA = vol.Schema({
+    vol.Required("entity_id"): cv.entity_id,
+    vol.Optional("etag"): cv.string,
+})
+
+TOGGLE_SCHEDULE_SCHEMA = cv.make_entity_service_schema({
+    vol.Optional("schedule_id"): cv.string,
+    vol.Required("enabled"): cv.boolean,
+    vol.Optional("expected_version"): cv.string,
+})
+
+SET_HOLD_SCHEMA = cv.make_entity_service_schema({
+    vol.Required("temperature"): vol.Coerce(float),
+    vol.Optional("mode", default="temporary"): vol.In(["temporary", "permanent"]),
+    vol.Optional("until"): cv.string,
+    vol.Optional("expected_version"): cv.string,
+})
+
+CLEAR_HOLD_SCHEMA = cv.make_entity_service_schema({
+    vol.Optional("expected_version"): cv.string,
+})
+
+REPLACE_PROGRAM_SCHEMA = cv.make_entity_service_schema({
+    vol.Required("schedules"): vol.All(cv.ensure_list, [dict]),
+    vol.Optional("expected_version"): cv.string,
+})
+
+EXPORT_SCHEDULES_SCHEMA = vol.Schema({
+    vol.Required("filename"): cv.string,
+    vol.Optional("overwrite", default=False): cv.boolean,
+})
+
+IMPORT_SCHEDULES_SCHEMA = vol.Schema({
+    vol.Required("filename"): cv.string,
+    vol.Optional("mode", default="merge"): vol.In(["merge", "replace"]),
+    vol.Optional("dry_run", default=False): cv.boolean,
+})
+
+SET_PROFILE_SCHEMA = vol.Schema({
+    vol.Required("profile_id"): cv.slug,
+    vol.Optional("name"): cv.string,
+    vol.Required("schedules"): vol.All(cv.ensure_list, [dict]),
+})
+
+DELETE_PROFILE_SCHEMA = vol.Schema({
+    vol.Required("profile_id"): cv.slug,
+})
+
+ASSIGN_PROFILE_SCHEMA = cv.make_entity_service_schema({
+    vol.Optional("profile_id"): vol.Any(None, cv.slug),
+    vol.Optional("expected_version"): cv.string,
+})
+
+# Export file layout version
+EXPORT_FORMAT_VERSION = 2
+_EXPORT_SUFFIXES = (".json", ".yaml", ".yml")
+# Export files live in this subdirectory of the configuration directory
+EXPORT_DIR = DOMAIN
+
 DEBUG_INFO_SCHEMA = vol.Schema({
     vol.Optional("entity_id"): cv.entity_id,
 })
 
 
+class ScheduleConflictError(HomeAssistantError):
+    """A schedule mutation's expected_version no longer matches."""
+
+
+def _parse_until(until: Any) -> Optional[datetime]:
+    """Parse a hold ``until`` value, treating naive times as local time."""
+    if not until:
+        return None
+    parsed = dt_util.parse_datetime(str(until))
+    if parsed is None:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
+    return parsed
+
+
+def _unexpired(item: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Return a hold/override unless its ``until`` has passed."""
+    if not item:
+        return None
+    until = _parse_until(item.get("until"))
+    if until and until <= dt_util.now():
+        return None
+    return item
+
+
+def _entry_from_dict(entity_id: str, data: Dict[str, Any]) -> Optional[ScheduleEntry]:
+    """Convert a stored schedule dict, skipping (and logging) invalid rows."""
+    try:
+        return ScheduleEntry.from_dict(data)
+    except (KeyError, TypeError, ValueError) as err:
+        _LOGGER.warning("Skipping invalid schedule %s for %s: %s", data.get("id"), entity_id, err)
+        return None
+
+
+def _config_file(hass: HomeAssistant, filename: str) -> Path:
+    """Resolve an import/export filename inside the integration's export directory.
+
+    Only plain file names are accepted, so an export can never land on the
+    user's own configuration files.
+    """
+    if not filename or "/" in filename or "\\" in filename or filename.startswith("."):
+        raise ValueError(f"{filename} must be a plain file name without directories")
+    if Path(filename).suffix.lower() not in _EXPORT_SUFFIXES:
+        raise ValueError(f"{filename} must end in .json, .yaml or .yml")
+    return Path(hass.config.path(EXPORT_DIR, filename))
+
+
+def _is_yaml(path: Path) -> bool:
+    return path.suffix.lower() in (".yaml", ".yml")
+
+
+def _is_export(path: Path) -> bool:
+    """Return True if path holds a file written by export_schedules."""
+    try:
+        with path.open(encoding="utf-8") as existing:
+            data = yaml.safe_load(existing) if _is_yaml(path) else json.load(existing)
+    except (OSError, ValueError, yaml.YAMLError):
+        return False
+    return isinstance(data, dict) and {"version", "exported_at", "schedules"} <= data.keys()
+
+
+def _write_export(path: Path, payload: Dict[str, Any], overwrite: bool = False) -> None:
+    """Stream the export to a temporary file, then move it into place.
+
+    An existing file is only replaced if it is an earlier export or
+    overwrite is set.
+    """
+    if path.exists() and not overwrite and not _is_export(path):
+        raise ValueError(
+            f"{path.name} already exists and is not a schedule export; "
+            "set overwrite to replace it"
+        )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f"{path.name}.tmp")
+    with temp_path.open("w", encoding="utf-8") as export_file:
+        if _is_yaml(path):
+            yaml.safe_dump(payload, export_file, sort_keys=False, allow_unicode=True)
+        else:
+            json.dump(payload, export_file, indent=2)
+    temp_path.replace(path)
+
+
+def _read_import(path: Path) -> Dict[str, Any]:
+    """Parse an export file into its profiles, assignments and schedules.
+
+    Version 1 files, and bare entity_id -> schedules mappings, hold only
+    per-thermostat schedules.
+    """
+    if not path.is_file():
+        raise ValueError(f"{path.name} does not exist")
+    with path.open(encoding="utf-8") as import_file:
+        data = yaml.safe_load(import_file) if _is_yaml(path) else json.load(import_file)
+    if not isinstance(data, dict):
+        raise ValueError(f"{path.name} does not contain exported schedules")
+    programs = data.get("schedules", data)
+    profiles = data.get("profiles") or {}
+    assignments = data.get("assignments") or {}
+    if not all(isinstance(part, dict) for part in (programs, profiles, assignments)):
+        raise ValueError(f"{path.name} does not contain exported schedules")
+    return {"profiles": profiles, "assignments": assignments, "schedules": programs}
+
+
+def _merge_slots(existing: List[Dict[str, Any]], slots: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Update existing slots with a matching id and append the rest."""
+    merged = {item["id"]: item for item in existing}
+    for slot in slots:
+        if slot.get("id") in merged:
+            merged[slot["id"]] = {**merged[slot["id"]], **slot}
+        else:
+            merged[slot.get("id") or uuid.uuid4().hex] = slot
+    return list(merged.values())
+
+
+def _profile_as_dict(profile: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "name": profile["name"],
+        "schedules": [entry.as_dict() for entry in profile["schedules"]],
+    }
+
+
+def _build_program(slots: List[Any]) -> Tuple[List[ScheduleEntry], List[str]]:
+    """Validate a complete list of slots and build its entries.
+
+    Returns the entries and a list of problems, which also covers slots
+    that would fire at the same weekday and time and repeated ids.
+    """
+    now = dt_util.utcnow().timestamp()
+    entries: List[ScheduleEntry] = []
+    errors: List[str] = []
+    seen_times: Dict[Tuple[int, int], int] = {}
+    seen_ids: set = set()
+    for number, slot in enumerate(slots, start=1):
+        try:
+            mask = weekday_mask(cv.ensure_list(slot["weekdays"]), strict=True)
+            if not mask:
+                raise ValueError("no valid weekdays")
+            minute = parse_time(slot["time"])
+            temperature = float(slot["temperature"])
+        except KeyError as err:
+            errors.append(f"slot {number}: missing {err}")
+            continue
+        except (TypeError, ValueError) as err:
+            errors.append(f"slot {number}: {err}")
+            continue
+        for day in range(7):
+            if not mask & (1 << day):
+                continue
+            other = seen_times.setdefault((day, minute), number)
+            if other != number:
+                errors.append(
+                    f"slot {number}: duplicates slot {other} on "
+                    f"{WEEKDAYS[day]} at {format_time(minute)}"
+                )
+        schedule_id = str(slot.get("id") or uuid.uuid4().hex)
+        if schedule_id in seen_ids:
+            errors.append(f"slot {number}: duplicate id {schedule_id}")
+        seen_ids.add(schedule_id)
+        created = dt_util.parse_datetime(str(slot.get("created") or ""))
+        entries.append(
+            ScheduleEntry(
+                id=schedule_id,
+                weekday_mask=mask,
+                minute=minute,
+                temperature=temperature,
+                name=slot.get("name") or f"Schedule {number}",
+                enabled=bool(slot.get("enabled", True)),
+                created=created.timestamp() if created else now,
+            )
+        )
+    return entries, errors
+
+
 class ScheduleManager:
-    """Manage thermostat schedules and holds."""
+    """Manage thermostat schedules, shared profiles and holds.
+
+    A thermostat either owns its schedule list or references a named
+    profile. Profile-backed thermostats share the profile's entries and
+    compiled timeline; editing one of them copies the profile into a
+    private list first (copy-on-write), while editing the profile itself
+    changes every thermostat that still references it.
+    """
 
-    def __init__(self, hass: HomeAssistant):
+    def __init__(self, hass: HomeAssistant, save_delay: float = DEFAULT_SAVE_DELAY):
         self.hass = hass
-        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
-        self._schedules: Dict[str, List[Dict[str, Any]]] = {}
+        # Seconds to coalesce journal writes; 0 writes on every change
+        self._storage = ScheduleStorage(hass, self._data_to_save, save_delay)
+        # Entity and profile schedule lists are immutable tuples of frozen
+        # entries; changes swap in a new tuple (see _apply_record)
+        self._schedules: Dict[str, Tuple[ScheduleEntry, ...]] = {}
+        # Shared programs: profile_id -> {"name": str, "schedules": (ScheduleEntry, ...)}
+        self._profiles: Dict[str, Dict[str, Any]] = {}
+        self._profile_timelines: Dict[str, ScheduleTimeline] = {}
+        # entity_id -> profile_id for thermostats following a profile
+        self._assignments: Dict[str, str] = {}
         self._holds: Dict[str, Dict[str, Any]] = {}
+        self._overrides: Dict[str, Dict[str, Any]] = {}
+        self._timelines: Dict[str, ScheduleTimeline] = {}
+        self._listeners: Dict[str, List[Callable[[Dict[str, Any]], None]]] = {}
+        # Per-entity counter bumped on every schedule or hold change
+        self._versions: Dict[str, int] = {}
+        # Distinguishes versions across restarts, when the counters start over
+        self._epoch = uuid.uuid4().hex[:8]
+        # One heap and one timer for every entity's next transition
+        self._scheduler = TransitionScheduler(hass, self._async_transition_due)
+        # Hold and safety override expiries, keyed "<kind>:<entity_id>"
+        self._expiries = TransitionScheduler(hass, self._async_expiry_due)
+        # Journal records held back while a batch() is open
+        self._batch_records: Optional[List[Dict[str, Any]]] = None
 
     async def async_load(self) -> None:
-        data = await self._store.async_load()
+        data, records = await self._storage.async_load()
+        changed = False
         if data:
-            self._schedules = data.get("schedules", {})
+            for eid, items in data.get("schedules", {}).items():
+                entries = []
+                for sch in items:
+                    if "id" not in sch:
+                        sch = {**sch, "id": uuid.uuid4().hex}
+                        changed = True
+                    entry = _entry_from_dict(eid, sch)
+                    if entry:
+                        entries.append(entry)
+                self._schedules[eid] = tuple(entries)
+            for profile_id, profile in data.get("profiles", {}).items():
+                self._profiles[profile_id] = {
+                    "name": profile.get("name") or profile_id,
+                    "schedules": tuple(
+                        entry
+                        for sch in profile.get("schedules", [])
+                        if (entry := _entry_from_dict(profile_id, sch))
+                    ),
+                }
+            self._assignments = data.get("assignments", {})
             self._holds = data.get("holds", {})
-        changed = False
-        for eid, items in self._schedules.items():
-            for sch in items:
-                if "id" not in sch:
-                    sch["id"] = uuid.uuid4().hex
-                    changed = True
-        if changed:
-            await self.async_save()
-        _LOGGER.info("Loaded schedules for %d entities (%d holds)", len(self._schedules), len(self._holds))
+            self._overrides = data.get("overrides", {})
+        for record in records:
+            self._apply_record(record)
+        for eid, profile_id in list(self._assignments.items()):
+            if profile_id not in self._profiles:
+                # A hand-edited store or a lost journal record; fall back to
+                # the thermostat's own schedules, if any
+                _LOGGER.warning(
+                    "Detaching %s from missing schedule profile %s", eid, profile_id
+                )
+                del self._assignments[eid]
+                changed = True
+        for profile_id in self._profiles:
+            self._rebuild_profile_index(profile_id)
+        entity_ids = set(self._schedules) | set(self._assignments)
+        for eid in entity_ids:
+            self._rebuild_index(eid)
+        for eid in entity_ids:
+            self._reschedule(eid)
+        for eid in self._holds:
+            self._arm_expiry("hold", eid)
+        for eid in self._overrides:
+            self._arm_expiry("override", eid)
+        if changed or self._storage.needs_compaction:
+            self._storage.async_request_compaction()
+        _LOGGER.info(
+            "Loaded schedules for %d entities, %d profiles (%d holds)",
+            len(entity_ids), len(self._profiles), len(self._holds),
+        )
+
+    def _data_to_save(self) -> Dict[str, Any]:
+        return {
+            "schedules": {
+                eid: [entry.as_dict() for entry in items]
+                for eid, items in self._schedules.items()
+            },
+            "profiles": {
+                profile_id: _profile_as_dict(profile)
+                for profile_id, profile in self._profiles.items()
+            },
+            # Copies, so later changes cannot reach a snapshot being written
+            "assignments": dict(self._assignments),
+            "holds": dict(self._holds),
+            "overrides": dict(self._overrides),
+        }
 
     async def async_save(self) -> None:
-        await self._store.async_save({"schedules": self._schedules, "holds": self._holds})
+        """Write pending journal records immediately."""
+        await self._storage.async_flush()
+
+    @callback
+    def _commit(self, record: Dict[str, Any]) -> None:
+        """Apply a mutation record in memory and queue it for the journal.
+
+        Callers return as soon as memory is updated; the journal write is
+        coalesced in the background.
+        """
+        op = record["op"]
+        if op == "profile":
+            # Thermostats detached by a profile deletion are captured first
+            entity_ids = self.profile_entities(record["profile_id"])
+        self._apply_record(record)
+        if op == "profile":
+            self._rebuild_profile_index(record["profile_id"])
+            for entity_id in entity_ids:
+                self._rebuild_index(entity_id)
+        else:
+            entity_ids = [record["entity_id"]]
+            if op in ("hold", "override"):
+                self._arm_expiry(op, record["entity_id"])
+            else:
+                self._rebuild_index(record["entity_id"])
+        if isinstance(record.get("schedule"), ScheduleEntry):
+            record = {**record, "schedule": record["schedule"].as_dict()}
+        elif op == "replace":
+            record = {**record, "schedules": [entry.as_dict() for entry in record["schedules"]]}
+        elif op == "profile" and record["profile"]:
+            record = {**record, "profile": _profile_as_dict(record["profile"])}
+        if self._batch_records is not None:
+            self._batch_records.append(record)
+        else:
+            self._storage.async_append(record)
+        for entity_id in entity_ids:
+            self._versions[entity_id] = self._versions.get(entity_id, 0) + 1
+            self._reschedule(entity_id)
+            async_dispatcher_send(self.hass, SIGNAL_SCHEDULE_CHANGED.format(entity_id))
+            if op in ("profile", "assign"):
+                # The effective list changed wholesale
+                change = {
+                    "change": "replace",
+                    "entity_id": entity_id,
+                    "profile_id": self._assignments.get(entity_id),
+                    "schedules": self.list(entity_id),
+                }
+            else:
+                change = {"change": op, **record}
+            for listener in list(self._listeners.get(entity_id, [])):
+                listener(change)
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Group mutations so their journal records are written together.
+
+        Changes still apply in memory immediately; only persistence is
+        deferred until the outermost batch exits.
+        """
+        if self._batch_records is not None:
+            yield
+            return
+        self._batch_records = []
+        try:
+            yield
+        finally:
+            records, self._batch_records = self._batch_records, None
+            self._storage.async_append_many(records)
+
+    @callback
+    def _reschedule(self, entity_id: str) -> None:
+        """Queue the entity's next transition in the shared scheduler."""
+        self._scheduler.async_schedule(entity_id, self.next_transition(entity_id))
+
+    @callback
+    def _async_transition_due(self, entity_id: str) -> None:
+        """Signal the owning entity that a transition is due and queue the next."""
+        async_dispatcher_send(self.hass, SIGNAL_SCHEDULE_DUE.format(entity_id))
+        self._reschedule(entity_id)
+
+    @callback
+    def _arm_expiry(self, kind: str, entity_id: str) -> None:
+        """Track when the entity's hold or safety override runs out."""
+        item = (self._holds if kind == "hold" else self._overrides).get(entity_id)
+        until = _parse_until(item.get("until")) if item else None
+        self._expiries.async_schedule(f"{kind}:{entity_id}", until)
+
+    @callback
+    def _async_expiry_due(self, key: str) -> None:
+        """Remove an expired hold or override and restore the scheduled setpoint.
+
+        The removal goes through _commit, so it is persisted once and the
+        entity is signalled to re-apply its schedule.
+        """
+        kind, entity_id = key.split(":", 1)
+        store = self._holds if kind == "hold" else self._overrides
+        item = store.get(entity_id)
+        if not item:
+            return
+        until = _parse_until(item.get("until"))
+        if until and until > dt_util.now():
+            # Replaced by a later expiry in the meantime
+            self._arm_expiry(kind, entity_id)
+            return
+        self._commit({"op": kind, "entity_id": entity_id, kind: None})
+        if kind == "hold":
+            self.hass.bus.async_fire(
+                EVENT_HOLD_CHANGED,
+                {"entity_ids": [entity_id], "change": "expired"},
+            )
+        else:
+            self.hass.bus.async_fire(
+                EVENT_SAFETY_OVERRIDE_CHANGED,
+                {"entity_ids": [entity_id], "change": "expired"},
+            )
+
+    @callback
+    def async_set_save_delay(self, save_delay: float) -> None:
+        """Change how long changes are batched before they are saved."""
+        self._storage.async_set_save_delay(save_delay)
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Stop the shared transition and expiry timers."""
+        self._scheduler.async_shutdown()
+        self._expiries.async_shutdown()
+
+    async def async_unload(self) -> None:
+        """Stop timers, drop subscribers and persist pending changes.
+
+        Subscribers get a final ``unloaded`` change so they know to
+        subscribe again once the integration is back.
+        """
+        self.async_shutdown()
+        listeners, self._listeners = self._listeners, {}
+        for entity_id, entity_listeners in listeners.items():
+            change = {"change": "unloaded", "entity_id": entity_id}
+            for listener in entity_listeners:
+                listener(change)
+        await self._storage.async_close()
+
+    @callback
+    def async_subscribe(
+        self, entity_id: str, listener: Callable[[Dict[str, Any]], None]
+    ) -> Callable[[], None]:
+        """Call listener with each change to the entity's schedules or hold."""
+        self._listeners.setdefault(entity_id, []).append(listener)
+
+        @callback
+        def _unsubscribe() -> None:
+            listeners = self._listeners.get(entity_id, [])
+            if listener in listeners:
+                listeners.remove(listener)
+            if not listeners:
+                self._listeners.pop(entity_id, None)
+
+        return _unsubscribe
+
+    def _apply_record(self, record: Dict[str, Any]) -> None:
+        """Apply one journal record to the in-memory state.
+
+        Used both for live mutations (with a ScheduleEntry) and for replaying
+        the journal on load (with the stored dict).
+        """
+        op = record.get("op")
+        entity_id = record.get("entity_id")
+        if op in ("hold", "override"):
+            store = self._holds if op == "hold" else self._overrides
+            if record.get(op):
+                store[entity_id] = record[op]
+            else:
+                store.pop(entity_id, None)
+            return
+        if op == "profile":
+            self._apply_profile_record(record)
+            return
+        if op == "assign":
+            profile_id = record.get("profile_id")
+            if profile_id is None:
+                self._detach(entity_id)
+            elif profile_id in self._profiles:
+                self._schedules.pop(entity_id, None)
+                self._assignments[entity_id] = profile_id
+            return
+        # Any direct edit gives a profile-backed thermostat its own copy
+        self._detach(entity_id)
+        if op == "replace":
+            entries = []
+            for item in record["schedules"]:
+                if not isinstance(item, ScheduleEntry):
+                    item = _entry_from_dict(entity_id, item)
+                if item is not None:
+                    entries.append(item)
+            self._schedules[entity_id] = tuple(entries)
+            return
+        # Lists are swapped, never edited in place, so earlier reads stay valid
+        items = self._schedules.get(entity_id, ())
+        if op in ("add", "update", "toggle"):
+            entry = record["schedule"]
+            if not isinstance(entry, ScheduleEntry):
+                entry = _entry_from_dict(entity_id, entry)
+                if entry is None:
+                    return
+            if any(existing.id == entry.id for existing in items):
+                items = tuple(entry if existing.id == entry.id else existing for existing in items)
+            else:
+                items = (*items, entry)
+            self._schedules[entity_id] = items
+        elif op == "delete":
+            self._schedules[entity_id] = tuple(
+                entry for entry in items if entry.id != record["schedule_id"]
+            )
+        else:
+            _LOGGER.warning("Ignoring unknown schedule journal operation %s", op)
+
+    def _apply_profile_record(self, record: Dict[str, Any]) -> None:
+        """Create, replace or (with a None profile) delete a shared profile."""
+        profile_id = record["profile_id"]
+        profile = record.get("profile")
+        if not profile:
+            # Thermostats keep running the deleted program as their own copy
+            for entity_id in self.profile_entities(profile_id):
+                self._detach(entity_id)
+            self._profiles.pop(profile_id, None)
+            return
+        entries = []
+        for item in profile.get("schedules", []):
+            if not isinstance(item, ScheduleEntry):
+                item = _entry_from_dict(profile_id, item)
+            if item is not None:
+                entries.append(item)
+        self._profiles[profile_id] = {
+            "name": profile.get("name") or profile_id,
+            "schedules": tuple(entries),
+        }
+
+    def _detach(self, entity_id: str) -> None:
+        """Give a profile-backed thermostat a private copy of the profile's schedules."""
+        profile_id = self._assignments.pop(entity_id, None)
+        if profile_id is not None:
+            # Entries are immutable, so sharing them is enough
+            self._schedules[entity_id] = self._profiles[profile_id]["schedules"]
+
+    def _entries(self, entity_id: str) -> Tuple[ScheduleEntry, ...]:
+        """Return the schedules in effect for the entity, private or shared."""
+        profile_id = self._assignments.get(entity_id)
+        if profile_id is not None:
+            return self._profiles[profile_id]["schedules"]
+        return self._schedules.get(entity_id, ())
+
+    def profile_entities(self, profile_id: str) -> List[str]:
+        """Return the thermostats currently following a profile."""
+        return [eid for eid, pid in self._assignments.items() if pid == profile_id]
+
+    def profiles(self) -> Dict[str, Dict[str, Any]]:
+        """Return every profile with its schedules and the thermostats using it."""
+        return {
+            profile_id: {
+                **_profile_as_dict(profile),
+                "entity_ids": self.profile_entities(profile_id),
+            }
+            for profile_id, profile in self._profiles.items()
+        }
 
     def list(self, entity_id: str) -> List[Dict[str, Any]]:
-        return self._schedules.get(entity_id, [])
-
-    async def async_add(self, entity_id: str, schedule: Dict[str, Any]) -> Dict[str, Any]:
-        self._schedules.setdefault(entity_id, [])
-        entry = {
-            "id": uuid.uuid4().hex,
-            "weekdays": schedule["weekdays"],
-            # already validated format HH:MM (string), keep as string
-            "time": schedule["time"],
-            "temperature": schedule["temperature"],
-            "name": schedule.get("name") or f"Schedule {len(self._schedules[entity_id]) + 1}",
-            "enabled": True,
-            "created": datetime.now().isoformat(),
+        return [entry.as_dict() for entry in self._entries(entity_id)]
+
+    def version(self, entity_id: str) -> int:
+        """Return a counter that changes whenever the entity's schedules or hold change."""
+        return self._versions.get(entity_id, 0)
+
+    def etag(self, entity_id: str) -> str:
+        """Return an opaque tag that changes with the entity's schedules or hold."""
+        return f"{self._epoch}-{self.version(entity_id)}"
+
+    def _check_version(self, entity_id: str, expected_version: Optional[str]) -> None:
+        """Raise ScheduleConflictError unless expected_version is current.
+
+        Checked and committed without an await in between, so the
+        compare-and-swap is atomic on the event loop.
+        """
+        if expected_version is not None and expected_version != self.etag(entity_id):
+            raise ScheduleConflictError(
+                f"Schedules for {entity_id} were changed by someone else "
+                f"(expected version {expected_version}, current {self.etag(entity_id)})"
+            )
+
+    def count(self, entity_id: str) -> int:
+        return len(self._entries(entity_id))
+
+    def schedule_ids(self, entity_id: str) -> List[str]:
+        return [entry.id for entry in self._entries(entity_id)]
+
+    def _rebuild_index(self, entity_id: str) -> None:
+        """Recompile the lookup timeline after the entity's schedules changed.
+
+        Profile-backed thermostats point at the profile's shared timeline.
+        """
+        profile_id = self._assignments.get(entity_id)
+        if profile_id is not None:
+            timeline = self._profile_timelines.get(profile_id)
+        else:
+            items = self._schedules.get(entity_id)
+            timeline = ScheduleTimeline(items) if items else None
+        if timeline is not None:
+            self._timelines[entity_id] = timeline
+        else:
+            self._timelines.pop(entity_id, None)
+
+    def _rebuild_profile_index(self, profile_id: str) -> None:
+        """Recompile the timeline shared by a profile's thermostats."""
+        profile = self._profiles.get(profile_id)
+        if profile and profile["schedules"]:
+            self._profile_timelines[profile_id] = ScheduleTimeline(profile["schedules"])
+        else:
+            self._profile_timelines.pop(profile_id, None)
+
+    async def async_add(
+        self, entity_id: str, schedule: Dict[str, Any], expected_version: Optional[str] = None
+    ) -> Dict[str, Any]:
+        self._check_version(entity_id, expected_version)
+        entry = ScheduleEntry(
+            id=uuid.uuid4().hex,
+            weekday_mask=weekday_mask(schedule["weekdays"], strict=True),
+            minute=parse_time(schedule["time"]),
+            temperature=float(schedule["temperature"]),
+            name=schedule.get("name") or f"Schedule {self.count(entity_id) + 1}",
+            created=dt_util.utcnow().timestamp(),
+        )
+        self._commit({"op": "add", "entity_id": entity_id, "schedule": entry})
+        return entry.as_dict()
+
+    async def async_replace_program(
+        self, entity_id: str, slots: List[Dict[str, Any]], expected_version: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Swap in a complete weekly program as a single change.
+
+        Every slot is validated first, including slots that would fire at
+        the same weekday and time; nothing changes unless all are valid.
+        Raises ValueError listing every problem found.
+        """
+        self._check_version(entity_id, expected_version)
+        entries, errors = _build_program(slots)
+        if errors:
+            raise ValueError("Invalid program: " + "; ".join(errors))
+        self._commit({"op": "replace", "entity_id": entity_id, "schedules": entries})
+        return [entry.as_dict() for entry in entries]
+
+    async def async_set_profile(
+        self, profile_id: str, name: Optional[str], slots: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Create or replace a shared profile; its thermostats follow the change.
+
+        Raises ValueError listing every problem found in the slots.
+        """
+        entries, errors = _build_program(slots)
+        if errors:
+            raise ValueError("Invalid program: " + "; ".join(errors))
+        existing = self._profiles.get(profile_id)
+        profile = {
+            "name": name or (existing["name"] if existing else profile_id),
+            "schedules": entries,
         }
-        self._schedules[entity_id].append(entry)
-        await self.async_save()
-        return entry
-
-    def current_match(self, entity_id: str) -> Optional[Dict[str, Any]]:
-        """Return latest schedule whose time has passed today for current weekday."""
-        items = self.list(entity_id)
-        if not items:
-            return None
-        now = datetime.now()
-        weekday = now.strftime("%A").lower()
-        current_time = now.time()
-        candidates: List[Dict[str, Any]] = []
-        for s in items:
-            if not s.get("enabled", True):
+        self._commit({"op": "profile", "profile_id": profile_id, "profile": profile})
+        return _profile_as_dict(profile)
+
+    async def async_delete_profile(self, profile_id: str) -> bool:
+        """Delete a profile; thermostats using it keep a private copy."""
+        if profile_id not in self._profiles:
+            return False
+        self._commit({"op": "profile", "profile_id": profile_id, "profile": None})
+        return True
+
+    async def async_assign_profile(
+        self, entity_id: str, profile_id: Optional[str], expected_version: Optional[str] = None
+    ) -> None:
+        """Point a thermostat at a profile, or detach it with None.
+
+        Assigning discards the thermostat's own schedules; detaching keeps
+        the profile's schedules as a private copy.
+        """
+        self._check_version(entity_id, expected_version)
+        if profile_id is not None and profile_id not in self._profiles:
+            raise ValueError(f"Unknown schedule profile {profile_id}")
+        if self._assignments.get(entity_id) == profile_id:
+            return
+        self._commit({"op": "assign", "entity_id": entity_id, "profile_id": profile_id})
+
+    def export_programs(self) -> Dict[str, Dict[str, Any]]:
+        """Return the profiles, profile assignments and private schedules.
+
+        Thermostats following a profile appear under assignments only, so
+        an import restores them as profile-backed.
+        """
+        return {
+            "profiles": {
+                profile_id: _profile_as_dict(profile)
+                for profile_id, profile in sorted(self._profiles.items())
+            },
+            "assignments": dict(sorted(self._assignments.items())),
+            "schedules": {
+                entity_id: self.list(entity_id)
+                for entity_id in sorted(self._schedules)
+                if entity_id not in self._assignments
+            },
+        }
+
+    async def async_import_programs(
+        self, data: Dict[str, Dict[str, Any]], mode: str, dry_run: bool = False
+    ) -> Dict[str, Any]:
+        """Validate and apply imported profiles and programs with one save.
+
+        ``merge`` updates schedules with a matching id and adds the rest;
+        ``replace`` swaps each listed profile's or entity's program for the
+        imported one. Assigned thermostats are pointed at their profile;
+        assignments to a profile that exists neither in ``data`` nor here
+        are skipped with a warning. Profiles and entities not in ``data``
+        are left alone. Nothing is
+        applied if anything is invalid or ``dry_run`` is set.
+        """
+        errors: List[str] = []
+        profiles: Dict[str, Dict[str, Any]] = {}
+        for profile_id, profile in data.get("profiles", {}).items():
+            try:
+                cv.slug(profile_id)
+            except vol.Invalid:
+                errors.append(f"profile {profile_id}: not a valid profile id")
                 continue
-            if weekday not in [d.lower() for d in s.get("weekdays", [])]:
+            slots = profile.get("schedules") if isinstance(profile, dict) else None
+            if not isinstance(slots, list) or not all(isinstance(slot, dict) for slot in slots):
+                errors.append(f"profile {profile_id}: schedules must be a list of slots")
                 continue
-            try:
-                schedule_time = datetime.strptime(s["time"], "%H:%M").time()
-            except ValueError:
+            existing = self._profiles.get(profile_id)
+            if mode == "merge" and existing:
+                slots = _merge_slots(_profile_as_dict(existing)["schedules"], slots)
+            entries, profile_errors = _build_program(slots)
+            errors.extend(f"profile {profile_id}: {error}" for error in profile_errors)
+            profiles[profile_id] = {
+                "name": profile.get("name") or (existing["name"] if existing else profile_id),
+                "schedules": entries,
+            }
+
+        assignments: Dict[str, str] = {}
+        warnings: List[str] = []
+        for entity_id, profile_id in data.get("assignments", {}).items():
+            if profile_id not in profiles and profile_id not in self._profiles:
+                # Left as it is rather than pointed at a profile that doesn't exist
+                warnings.append(f"{entity_id}: skipped, unknown schedule profile {profile_id}")
+                _LOGGER.warning(
+                    "Not importing assignment of %s to missing schedule profile %s",
+                    entity_id, profile_id,
+                )
+            elif entity_id in data.get("schedules", {}):
+                errors.append(f"{entity_id}: has both a profile and its own schedules")
+            else:
+                assignments[entity_id] = profile_id
+
+        results: Dict[str, List[ScheduleEntry]] = {}
+        for entity_id, slots in data.get("schedules", {}).items():
+            if not isinstance(slots, list) or not all(isinstance(slot, dict) for slot in slots):
+                errors.append(f"{entity_id}: schedules must be a list of slots")
                 continue
-            if current_time >= schedule_time:
-                candidates.append((schedule_time, s))
-        if not candidates:
+            if mode == "merge":
+                slots = _merge_slots(self.list(entity_id), slots)
+            entries, entity_errors = _build_program(slots)
+            errors.extend(f"{entity_id}: {error}" for error in entity_errors)
+            results[entity_id] = entries
+        summary = {
+            "mode": mode,
+            "dry_run": dry_run,
+            "profiles": len(profiles),
+            "assignments": len(assignments),
+            "entities": len(results) + len(assignments),
+            "schedules": sum(len(entries) for entries in results.values())
+            + sum(len(profile["schedules"]) for profile in profiles.values()),
+            "errors": errors,
+            "warnings": warnings,
+        }
+        if errors or dry_run:
+            return summary
+        with self.batch():
+            # Profiles first, so assignments can refer to new ones
+            for profile_id, profile in profiles.items():
+                self._commit({"op": "profile", "profile_id": profile_id, "profile": profile})
+            for entity_id, profile_id in assignments.items():
+                if self._assignments.get(entity_id) != profile_id:
+                    self._commit({"op": "assign", "entity_id": entity_id, "profile_id": profile_id})
+            for entity_id, entries in results.items():
+                self._commit({"op": "replace", "entity_id": entity_id, "schedules": entries})
+        return summary
+
+    def current_match(self, entity_id: str) -> Optional[ScheduleEntry]:
+        """Return the schedule whose transition most recently passed this week."""
+        timeline = self._timelines.get(entity_id)
+        if not timeline:
             return None
-        # pick latest time
-        candidates.sort(key=lambda x: x[0])
-        return candidates[-1][1]
+        return timeline.current(dt_util.now())
 
     def next_setpoint(self, entity_id: str) -> Optional[Dict[str, Any]]:
-        """Compute next setpoint later today or tomorrow."""
-        items = self.list(entity_id)
-        if not items:
+        """Compute the next setpoint within the coming 7-day cycle."""
+        timeline = self._timelines.get(entity_id)
+        if not timeline:
             return None
-        now = datetime.now()
-        weekday_index = now.weekday()  # Monday=0
-        # Build sequence of next 2 days to find next future time
-        for day_offset in range(0, 2):
-            check_date = now + timedelta(days=day_offset)
-            wd = check_date.strftime("%A").lower()
-            future: List[tuple[datetime, Dict[str, Any]]] = []
-            for s in items:
-                if not s.get("enabled", True):
-                    continue
-                if wd not in [d.lower() for d in s.get("weekdays", [])]:
-                    continue
-                try:
-                    schedule_time = datetime.strptime(s["time"], "%H:%M").time()
-                except ValueError:
-                    continue
-                candidate_dt = datetime.combine(check_date.date(), schedule_time)
-                if candidate_dt > now:
-                    future.append((candidate_dt, s))
-            if future:
-                future.sort(key=lambda x: x[0])
-                dt, sched = future[0]
-                return {
-                    "time": dt.isoformat(),
-                    "temperature": sched["temperature"],
-                    "schedule_id": sched["id"],
-                    "name": sched.get("name"),
-                }
-        return None
+        upcoming = timeline.next(dt_util.now())
+        if not upcoming:
+            return None
+        dt, entry = upcoming
+        return {
+            "time": dt.isoformat(),
+            "temperature": entry.temperature,
+            "schedule_id": entry.id,
+            "name": entry.name,
+        }
+
+    def next_transition(self, entity_id: str) -> Optional[datetime]:
+        """Return when the entity's next schedule transition happens.
+
+        Hold and override expiries are tracked separately (see _arm_expiry).
+        """
+        timeline = self._timelines.get(entity_id)
+        if not timeline:
+            return None
+        upcoming = timeline.next(dt_util.now())
+        return upcoming[0] if upcoming else None
 
     def as_dict(self, entity_id: str) -> Dict[str, Any]:
-        return {"schedules": self.list(entity_id), "hold": self.active_hold(entity_id)}
+        return {
+            "schedules": self.list(entity_id),
+            "profile_id": self._assignments.get(entity_id),
+            "hold": self.active_hold(entity_id),
+        }
 
-    def _find(self, entity_id: str, schedule_id: str) -> Optional[Dict[str, Any]]:
-        for s in self.list(entity_id):
-            if s.get("id") == schedule_id:
-                return s
+    def _find(self, entity_id: str, schedule_id: str) -> Optional[ScheduleEntry]:
+        for entry in self._entries(entity_id):
+            if entry.id == schedule_id:
+                return entry
         return None
 
-    async def async_update(self, entity_id: str, schedule_id: str, **changes) -> Optional[Dict[str, Any]]:
-        sched = self._find(entity_id, schedule_id)
-        if not sched:
+    async def async_update(
+        self, entity_id: str, schedule_id: str, expected_version: Optional[str] = None, **changes
+    ) -> Optional[Dict[str, Any]]:
+        self._check_version(entity_id, expected_version)
+        entry = self._find(entity_id, schedule_id)
+        if not entry:
             return None
-        for key in ("weekdays", "time", "temperature", "name"):
-            if key in changes and changes[key] is not None:
-                sched[key] = changes[key]
-        sched["updated"] = datetime.now().isoformat()
-        await self.async_save()
-        return sched
-
-    async def async_delete(self, entity_id: str, schedule_id: str) -> bool:
-        items = self.list(entity_id)
-        new_items = [s for s in items if s.get("id") != schedule_id]
-        if len(new_items) == len(items):
+        fields: Dict[str, Any] = {}
+        if changes.get("weekdays") is not None:
+            fields["weekday_mask"] = weekday_mask(changes["weekdays"], strict=True)
+        if changes.get("time") is not None:
+            fields["minute"] = parse_time(changes["time"])
+        if changes.get("temperature") is not None:
+            fields["temperature"] = float(changes["temperature"])
+        if changes.get("name") is not None:
+            fields["name"] = changes["name"]
+        entry = replace(entry, **fields, updated=dt_util.utcnow().timestamp())
+        self._commit({"op": "update", "entity_id": entity_id, "schedule": entry})
+        return entry.as_dict()
+
+    async def async_delete(
+        self, entity_id: str, schedule_id: str, expected_version: Optional[str] = None
+    ) -> bool:
+        self._check_version(entity_id, expected_version)
+        if not self._find(entity_id, schedule_id):
             return False
-        self._schedules[entity_id] = new_items
-        await self.async_save()
+        self._commit({"op": "delete", "entity_id": entity_id, "schedule_id": schedule_id})
         return True
 
-    async def async_toggle(self, entity_id: str, schedule_id: str, enabled: bool) -> Optional[Dict[str, Any]]:
-        sched = self._find(entity_id, schedule_id)
-        if not sched:
-            return None
-        sched["enabled"] = enabled
-        sched["updated"] = datetime.now().isoformat()
-        await self.async_save()
-        return sched
+    async def async_toggle(
+        self,
+        entity_id: str,
+        schedule_id: Optional[str],
+        enabled: bool,
+        expected_version: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Enable or disable one schedule, or all of them without schedule_id.
+
+        The version is checked once up front: each toggle bumps it, and a
+        thermostat without schedules must still reject a stale version.
+        Returns the toggled schedules.
+        """
+        self._check_version(entity_id, expected_version)
+        if schedule_id:
+            entries = [entry] if (entry := self._find(entity_id, schedule_id)) else []
+        else:
+            entries = list(self._entries(entity_id))
+        toggled = []
+        now = dt_util.utcnow().timestamp()
+        for entry in entries:
+            entry = replace(entry, enabled=enabled, updated=now)
+            self._commit({"op": "toggle", "entity_id": entity_id, "schedule": entry})
+            toggled.append(entry.as_dict())
+        return toggled
 
-    async def async_set_hold(self, entity_id: str, mode: str, temperature: float, until: Optional[str]) -> Dict[str, Any]:
+    async def async_set_hold(
+        self,
+        entity_id: str,
+        mode: str,
+        temperature: float,
+        until: Optional[str],
+        expected_version: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        self._check_version(entity_id, expected_version)
         hold = {
             "mode": mode,
             "temperature": temperature,
             "until": until,
-            "created": datetime.now().isoformat(),
+            "created": dt_util.now().isoformat(),
         }
-        self._holds[entity_id] = hold
-        await self.async_save()
+        self._commit({"op": "hold", "entity_id": entity_id, "hold": hold})
         return hold
 
-    async def async_clear_hold(self, entity_id: str) -> None:
+    async def async_clear_hold(self, entity_id: str, expected_version: Optional[str] = None) -> None:
+        self._check_version(entity_id, expected_version)
         if entity_id in self._holds:
-            self._holds.pop(entity_id)
-            await self.async_save()
+            self._commit({"op": "hold", "entity_id": entity_id, "hold": None})
 
     def active_hold(self, entity_id: str) -> Optional[Dict[str, Any]]:
-        hold = self._holds.get(entity_id)
-        if not hold:
-            return None
-        until = hold.get("until")
-        if until:
-            try:
-                if datetime.fromisoformat(until) < datetime.now():
-                    # Expired hold – remove and persist asynchronously
-                    self._holds.pop(entity_id, None)
-                    # Fire-and-forget save (don't block attribute reads)
-                    self.hass.async_create_task(self.async_save())
-                    return None
-            except ValueError:
-                return hold
-        return hold
+        """Return the entity's unexpired hold without side effects."""
+        return _unexpired(self._holds.get(entity_id))
+
+    async def async_set_override(self, entity_id: str, temperature: float, until: datetime) -> Dict[str, Any]:
+        override = {
+            "temperature": temperature,
+            "until": until.isoformat(),
+            "created": dt_util.now().isoformat(),
+        }
+        self._commit({"op": "override", "entity_id": entity_id, "override": override})
+        return override
+
+    def active_override(self, entity_id: str) -> Optional[Dict[str, Any]]:
+        """Return the entity's unexpired safety override without side effects."""
+        return _unexpired(self._overrides.get(entity_id))
 
     # Added to satisfy climate entity usage and unify schedule/hold precedence
     def get_current_scheduled_temperature(self, entity_id: str) -> Optional[float]:
         """Return the effective target temperature now (hold overrides schedule).
 
         Precedence:
-        1. Active hold (temporary or permanent)
-        2. Latest matching schedule for today whose time has passed
-        3. None (no change)
+        1. Active safety override
+        2. Active hold (temporary or permanent)
+        3. Latest schedule transition that has passed in the weekly cycle
+        4. None (no change)
         """
+        override = self.active_override(entity_id)
+        if override:
+            return float(override["temperature"])
         hold = self.active_hold(entity_id)
         if hold:
             try:
@@ -264,80 +1121,117 @@ class ScheduleManager:
                 pass
         match = self.current_match(entity_id)
         if match:
-            try:
-                return float(match.get("temperature"))
-            except (TypeError, ValueError):
-                return None
+            return match.temperature
         return None
 
 
-async def async_setup_services(hass: HomeAssistant) -> None:
+async def async_setup_services(hass: HomeAssistant, save_delay: float = DEFAULT_SAVE_DELAY) -> None:
     """Set up services for Enhanced Z-Wave Thermostat."""
-    schedule_manager = ScheduleManager(hass)
+    schedule_manager = ScheduleManager(hass, save_delay)
     await schedule_manager.async_load()
     
     # Store schedule manager in hass data
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN]["schedule_manager"] = schedule_manager
     
+    async def _async_targets(call: ServiceCall) -> List[str]:
+        """Resolve the call's entity, area, floor and label targets once.
+
+        Only this integration's thermostats are returned; explicitly named
+        entities that are not are logged.
+        """
+        entity_registry = er.async_get(hass)
+        explicit = set(cv.ensure_list(call.data.get("entity_id")))
+        targets = []
+        for entity_id in sorted(await async_extract_entity_ids(hass, call)):
+            entity_entry = entity_registry.async_get(entity_id)
+            if entity_entry and entity_entry.platform == DOMAIN:
+                targets.append(entity_id)
+            elif entity_id in explicit:
+                _LOGGER.warning("Entity %s not found or not from this integration", entity_id)
+        return targets
+
+    def _expected_version(call: ServiceCall, entity_ids: List[str]) -> Optional[str]:
+        """Return the call's expected_version; it only makes sense for one thermostat."""
+        expected_version = call.data.get("expected_version")
+        if expected_version is not None and len(entity_ids) != 1:
+            raise ValueError("expected_version can only be used with a single thermostat")
+        return expected_version
+
     async def async_set_schedule(call: ServiceCall) -> None:
         """Handle set_schedule service call."""
         try:
-            entity_id = call.data["entity_id"]
             schedule = call.data[ATTR_SCHEDULE]
             
-            _LOGGER.info("Creating schedule for %s: %s", entity_id, schedule)
-            
             # Validate time format
             time_str = schedule["time"]
             try:
-                # Parse time to validate format
-                time_parts = time_str.split(":")
-                if len(time_parts) != 2:
-                    raise ValueError("Invalid time format")
-                hours, minutes = int(time_parts[0]), int(time_parts[1])
-                if not (0 <= hours <= 23 and 0 <= minutes <= 59):
-                    raise ValueError("Invalid time values")
-            except (ValueError, IndexError) as e:
+                parse_time(time_str)
+            except ValueError as e:
                 _LOGGER.error("Invalid time format '%s': %s", time_str, e)
                 raise ValueError(f"Invalid time format '{time_str}'. Use HH:MM format.")
-            
-            added = await schedule_manager.async_add(entity_id, schedule)
 
-            # Fire update event
-            entity_registry = er.async_get(hass)
-            entity_entry = entity_registry.async_get(entity_id)
-            
-            if entity_entry and entity_entry.platform == DOMAIN:
+            entity_ids = await _async_targets(call)
+            if not entity_ids:
+                return
+            _LOGGER.info("Creating schedule for %s: %s", ", ".join(entity_ids), schedule)
+
+            expected_version = _expected_version(call, entity_ids)
+            with schedule_manager.batch():
+                added = {
+                    entity_id: await schedule_manager.async_add(
+                        entity_id, schedule, expected_version
+                    )
+                    for entity_id in entity_ids
+                }
+
+            hass.bus.async_fire(
+                EVENT_SCHEDULE_UPDATED,
+                {"entity_ids": entity_ids, "change": "added", "schedules": added},
+            )
+            # Also compute next setpoints
+            setpoints = {
+                entity_id: next_sp
+                for entity_id in entity_ids
+                if (next_sp := schedule_manager.next_setpoint(entity_id))
+            }
+            if setpoints:
                 hass.bus.async_fire(
-                    EVENT_SCHEDULE_UPDATED,
-                    {"entity_id": entity_id, "change": "added", "schedule": added},
+                    EVENT_NEXT_SETPOINT,
+                    {"entity_ids": list(setpoints), "setpoints": setpoints},
                 )
-                # Also compute next setpoint
-                next_sp = schedule_manager.next_setpoint(entity_id)
-                if next_sp:
-                    hass.bus.async_fire(
-                        EVENT_NEXT_SETPOINT,
-                        {"entity_id": entity_id, **next_sp},
-                    )
-                _LOGGER.info("Schedule created successfully for %s", entity_id)
-            else:
-                _LOGGER.warning("Entity %s not found or not from this integration", entity_id)
+            _LOGGER.info("Schedule created successfully for %d thermostats", len(entity_ids))
         except Exception as e:
             _LOGGER.error("Failed to create schedule: %s", e)
             raise
 
-    async def async_get_schedules(call: ServiceCall) -> None:
-        """Return schedules via an event response (simple pattern)."""
-        entity_id = call.data.get("entity_id")
-        if not entity_id:
-            _LOGGER.error("get_schedules requires entity_id")
-            return
-        data = schedule_manager.as_dict(entity_id)
-        hass.bus.async_fire(
-            EVENT_SCHEDULE_UPDATED,
-            {"entity_id": entity_id, "change": "queried", **data},
-        )
+    async def async_get_schedules(call: ServiceCall) -> ServiceResponse:
+        """Return the entity's schedules and hold as the service response.
+
+        Callers passing the etag they last saw get a short not_modified
+        reply while nothing has changed. Calls without a response variable
+        get the earlier "queried" event instead.
+        """
+        entity_id = call.data["entity_id"]
+        if not call.return_response:
+            hass.bus.async_fire(
+                EVENT_SCHEDULE_UPDATED,
+                {
+                    "entity_ids": [entity_id],
+                    "change": "queried",
+                    **schedule_manager.as_dict(entity_id),
+                },
+            )
+            return None
+        etag = schedule_manager.etag(entity_id)
+        if call.data.get("etag") == etag:
+            return {"entity_id": entity_id, "etag": etag, "not_modified": True}
+        return {
+            "entity_id": entity_id,
+            "etag": etag,
+            "not_modified": False,
+            **schedule_manager.as_dict(entity_id),
+        }
 
     async def async_update_schedule(call: ServiceCall) -> None:
         entity_id = call.data.get("entity_id")
@@ -348,6 +1242,7 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         sched = await schedule_manager.async_update(
             entity_id,
             schedule_id,
+            expected_version=call.data.get("expected_version"),
             weekdays=call.data.get("weekdays"),
             time=call.data.get("time"),
             temperature=call.data.get("temperature"),
@@ -358,7 +1253,7 @@ async def async_setup_services(hass: HomeAssistant) -> None:
             return
         hass.bus.async_fire(
             EVENT_SCHEDULE_UPDATED,
-            {"entity_id": entity_id, "change": "updated", "schedule": sched},
+            {"entity_ids": [entity_id], "change": "updated", "schedule": sched},
         )
 
     async def async_delete_schedule(call: ServiceCall) -> None:
@@ -367,80 +1262,237 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         if not entity_id or not schedule_id:
             _LOGGER.error("delete_schedule requires entity_id and schedule_id")
             return
-        removed = await schedule_manager.async_delete(entity_id, schedule_id)
+        removed = await schedule_manager.async_delete(
+            entity_id, schedule_id, call.data.get("expected_version")
+        )
         if removed:
             hass.bus.async_fire(
                 EVENT_SCHEDULE_UPDATED,
-                {"entity_id": entity_id, "change": "deleted", "schedule_id": schedule_id},
+                {"entity_ids": [entity_id], "change": "deleted", "schedule_id": schedule_id},
             )
         else:
             _LOGGER.warning("Schedule %s not removed (not found) for %s", schedule_id, entity_id)
 
+    async def _async_require_admin(call: ServiceCall) -> None:
+        """Reject non-admin users, as admin services do."""
+        if call.context.user_id:
+            user = await hass.auth.async_get_user(call.context.user_id)
+            if user is None:
+                raise UnknownUser(context=call.context)
+            if not user.is_admin:
+                raise Unauthorized(context=call.context)
+
+    async def async_export_schedules(call: ServiceCall) -> ServiceResponse:
+        """Write every thermostat's schedules to a file in the export directory."""
+        await _async_require_admin(call)
+        path = _config_file(hass, call.data["filename"])
+        data = schedule_manager.export_programs()
+        payload = {
+            "version": EXPORT_FORMAT_VERSION,
+            "exported_at": dt_util.now().isoformat(),
+            **data,
+        }
+        await hass.async_add_executor_job(
+            _write_export, path, payload, call.data["overwrite"]
+        )
+        summary = {
+            "filename": str(path),
+            "profiles": len(data["profiles"]),
+            "entities": len(data["schedules"]) + len(data["assignments"]),
+            "schedules": sum(len(items) for items in data["schedules"].values())
+            + sum(len(profile["schedules"]) for profile in data["profiles"].values()),
+        }
+        _LOGGER.info("Exported %d schedules for %d thermostats and %d profiles to %s",
+                     summary["schedules"], summary["entities"], summary["profiles"], path)
+        return summary
+
+    async def async_import_schedules(call: ServiceCall) -> ServiceResponse:
+        """Load schedules from a file in the export directory."""
+        await _async_require_admin(call)
+        path = _config_file(hass, call.data["filename"])
+        try:
+            data = await hass.async_add_executor_job(_read_import, path)
+        except (OSError, json.JSONDecodeError, yaml.YAMLError) as err:
+            raise ValueError(f"Could not read {path.name}: {err}") from err
+        summary = await schedule_manager.async_import_programs(
+            data, call.data["mode"], call.data["dry_run"]
+        )
+        if summary["errors"] and not call.data["dry_run"]:
+            raise ValueError(
+                f"Import of {path.name} failed: " + "; ".join(summary["errors"][:10])
+            )
+        if not call.data["dry_run"]:
+            hass.bus.async_fire(
+                EVENT_SCHEDULE_UPDATED,
+                {
+                    "entity_ids": sorted(
+                        {*data["schedules"], *data["assignments"]}.union(
+                            *(
+                                schedule_manager.profile_entities(profile_id)
+                                for profile_id in data["profiles"]
+                            )
+                        )
+                    ),
+                    "change": "imported",
+                },
+            )
+        _LOGGER.info("Imported %s: %s", path, summary)
+        return summary
+
+    async def async_replace_program(call: ServiceCall) -> None:
+        """Replace the whole weekly program of the targeted thermostats."""
+        entity_ids = await _async_targets(call)
+        if not entity_ids:
+            return
+        expected_version = _expected_version(call, entity_ids)
+        with schedule_manager.batch():
+            programs = {
+                entity_id: await schedule_manager.async_replace_program(
+                    entity_id, call.data["schedules"], expected_version
+                )
+                for entity_id in entity_ids
+            }
+        hass.bus.async_fire(
+            EVENT_SCHEDULE_UPDATED,
+            {"entity_ids": entity_ids, "change": "replaced", "schedules": programs},
+        )
+
+    async def async_set_profile(call: ServiceCall) -> None:
+        """Create or replace a shared schedule profile."""
+        profile_id = call.data["profile_id"]
+        profile = await schedule_manager.async_set_profile(
+            profile_id, call.data.get("name"), call.data["schedules"]
+        )
+        hass.bus.async_fire(
+            EVENT_SCHEDULE_UPDATED,
+            {
+                "entity_ids": schedule_manager.profile_entities(profile_id),
+                "change": "profile_updated",
+                "profile_id": profile_id,
+                "profile": profile,
+            },
+        )
+
+    async def async_delete_profile(call: ServiceCall) -> None:
+        """Delete a shared schedule profile."""
+        profile_id = call.data["profile_id"]
+        entity_ids = schedule_manager.profile_entities(profile_id)
+        if not await schedule_manager.async_delete_profile(profile_id):
+            _LOGGER.warning("Schedule profile %s not found", profile_id)
+            return
+        hass.bus.async_fire(
+            EVENT_SCHEDULE_UPDATED,
+            {"entity_ids": entity_ids, "change": "profile_deleted", "profile_id": profile_id},
+        )
+
+    async def async_assign_profile(call: ServiceCall) -> None:
+        """Point the targeted thermostats at a profile, or detach them."""
+        profile_id = call.data.get("profile_id")
+        entity_ids = await _async_targets(call)
+        if not entity_ids:
+            return
+        expected_version = _expected_version(call, entity_ids)
+        with schedule_manager.batch():
+            for entity_id in entity_ids:
+                await schedule_manager.async_assign_profile(
+                    entity_id, profile_id, expected_version
+                )
+        hass.bus.async_fire(
+            EVENT_SCHEDULE_UPDATED,
+            {"entity_ids": entity_ids, "change": "profile_assigned", "profile_id": profile_id},
+        )
+
     async def async_toggle_schedule(call: ServiceCall) -> None:
-        entity_id = call.data.get("entity_id")
+        """Enable or disable one schedule, or every schedule of the targets."""
         schedule_id = call.data.get("schedule_id")
-        enabled = call.data.get("enabled")
-        if not entity_id or schedule_id is None or enabled is None:
-            _LOGGER.error("toggle_schedule requires entity_id, schedule_id, enabled")
-            return
-        sched = await schedule_manager.async_toggle(entity_id, schedule_id, bool(enabled))
-        if sched:
+        enabled = call.data["enabled"]
+        toggled: Dict[str, List[Dict[str, Any]]] = {}
+        entity_ids = await _async_targets(call)
+        expected_version = _expected_version(call, entity_ids)
+        with schedule_manager.batch():
+            for entity_id in entity_ids:
+                if scheds := await schedule_manager.async_toggle(
+                    entity_id, schedule_id, enabled, expected_version
+                ):
+                    toggled[entity_id] = scheds
+        if toggled:
             hass.bus.async_fire(
                 EVENT_SCHEDULE_UPDATED,
-                {"entity_id": entity_id, "change": "toggled", "schedule": sched},
+                {"entity_ids": list(toggled), "change": "toggled", "schedules": toggled},
             )
 
     async def async_set_hold(call: ServiceCall) -> None:
-        entity_id = call.data.get("entity_id")
-        mode = call.data.get("mode", "temporary")
-        temperature = call.data.get("temperature")
+        mode = call.data["mode"]
+        temperature = call.data["temperature"]
         until = call.data.get("until")
-        if temperature is None:
-            _LOGGER.error("set_hold requires temperature")
+        entity_ids = await _async_targets(call)
+        if not entity_ids:
             return
-        hold = await schedule_manager.async_set_hold(entity_id, mode, float(temperature), until)
+        expected_version = _expected_version(call, entity_ids)
+        with schedule_manager.batch():
+            holds = {
+                entity_id: await schedule_manager.async_set_hold(
+                    entity_id, mode, float(temperature), until, expected_version
+                )
+                for entity_id in entity_ids
+            }
         hass.bus.async_fire(
             EVENT_HOLD_CHANGED,
-            {"entity_id": entity_id, "change": "set", "hold": hold},
+            {"entity_ids": entity_ids, "change": "set", "hold": holds[entity_ids[0]]},
         )
 
     async def async_clear_hold(call: ServiceCall) -> None:
-        entity_id = call.data.get("entity_id")
-        await schedule_manager.async_clear_hold(entity_id)
+        entity_ids = await _async_targets(call)
+        if not entity_ids:
+            return
+        expected_version = _expected_version(call, entity_ids)
+        with schedule_manager.batch():
+            for entity_id in entity_ids:
+                await schedule_manager.async_clear_hold(entity_id, expected_version)
         hass.bus.async_fire(
             EVENT_HOLD_CHANGED,
-            {"entity_id": entity_id, "change": "cleared"},
+            {"entity_ids": entity_ids, "change": "cleared"},
         )
     
     async def async_set_home_away(call: ServiceCall) -> None:
         """Handle set_home_away service call."""
-        entity_id = call.data["entity_id"]
         mode = call.data[ATTR_HOME_AWAY_MODE]
-        
-        # Get the entity and set its preset mode
-        entity_registry = er.async_get(hass)
-        entity_entry = entity_registry.async_get(entity_id)
-        
-        if entity_entry and entity_entry.platform == DOMAIN:
+        entity_ids = await _async_targets(call)
+        if entity_ids:
+            # One preset call for every target
             await hass.services.async_call(
                 "climate",
                 "set_preset_mode",
-                {"entity_id": entity_id, "preset_mode": mode}
+                {"entity_id": entity_ids, "preset_mode": mode}
             )
     
     async def async_override_safety(call: ServiceCall) -> None:
         """Handle override_safety service call."""
-        entity_id = call.data["entity_id"]
         temperature = call.data["temperature"]
         duration = call.data.get("duration", 60)  # Default 1 hour
+        entity_ids = await _async_targets(call)
+        if not entity_ids:
+            return
         
         _LOGGER.warning(
             "Safety override requested for %s: %s°F for %s minutes",
-            entity_id, temperature, duration
+            ", ".join(entity_ids), temperature, duration
         )
         
-        # This would implement temporary safety override logic
-        # For now, just log the request
+        # Expires through the manager's expiry timer, which restores the
+        # scheduled setpoint
+        until = dt_util.now() + timedelta(minutes=duration)
+        with schedule_manager.batch():
+            overrides = {
+                entity_id: await schedule_manager.async_set_override(
+                    entity_id, float(temperature), until
+                )
+                for entity_id in entity_ids
+            }
+        hass.bus.async_fire(
+            EVENT_SAFETY_OVERRIDE_CHANGED,
+            {"entity_ids": entity_ids, "change": "set", "override": overrides[entity_ids[0]]},
+        )
         
     async def async_debug_info(call: ServiceCall) -> None:
         """Handle debug_info service call to help troubleshoot issues."""
@@ -492,8 +1544,14 @@ async def async_setup_services(hass: HomeAssistant) -> None:
                     "state": entry.state,
                 }
                 for entry in hass.config_entries.async_entries(DOMAIN)
-            ]
+            ],
         }
+        dispatcher = hass.data[DOMAIN].get("dispatcher")
+        if dispatcher is not None:
+            debug_info["dispatcher"] = dispatcher.metrics()
+        ack_tracker = hass.data[DOMAIN].get("ack_tracker")
+        if ack_tracker is not None:
+            debug_info["setpoint_acks"] = ack_tracker.metrics()
         
         _LOGGER.info("Enhanced Z-Wave Thermostat Debug Info: %s", debug_info)
         
@@ -519,6 +1577,11 @@ async def async_setup_services(hass: HomeAssistant) -> None:
             _LOGGER.info("  - %s: %s (state: %s)", entry.entry_id, entry.title, entry.state)
             _LOGGER.info("    Data: %s", entry.data)
         
+        if "dispatcher" in debug_info:
+            _LOGGER.info("Setpoint dispatcher: %s", debug_info["dispatcher"])
+        for entity_id, stats in debug_info.get("setpoint_acks", {}).items():
+            _LOGGER.info("  - %s acks: %s", entity_id, stats)
+
         _LOGGER.info("=== END DEBUG INFO ===")
         
         return debug_info
@@ -549,7 +1612,8 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         DOMAIN,
         SERVICE_GET_SCHEDULES,
         async_get_schedules,
-        schema=vol.Schema({vol.Required("entity_id"): cv.entity_id}),
+        schema=GET_SCHEDULES_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
     )
 
     hass.services.async_register(
@@ -559,10 +1623,11 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         schema=vol.Schema({
             vol.Required("entity_id"): cv.entity_id,
             vol.Required("schedule_id"): cv.string,
-            vol.Optional("weekdays"): [cv.string],
+            vol.Optional("weekdays"): vol.All(cv.ensure_list, [cv.string], _weekdays),
             vol.Optional("time"): cv.string,
             vol.Optional("temperature"): vol.Coerce(float),
             vol.Optional("name"): cv.string,
+            vol.Optional("expected_version"): cv.string,
         }),
     )
     hass.services.async_register(
@@ -572,34 +1637,64 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         schema=vol.Schema({
             vol.Required("entity_id"): cv.entity_id,
             vol.Required("schedule_id"): cv.string,
+            vol.Optional("expected_version"): cv.string,
         }),
     )
     hass.services.async_register(
         DOMAIN,
         SERVICE_TOGGLE_SCHEDULE,
         async_toggle_schedule,
-        schema=vol.Schema({
-            vol.Required("entity_id"): cv.entity_id,
-            vol.Required("schedule_id"): cv.string,
-            vol.Required("enabled"): cv.boolean,
-        }),
+        schema=TOGGLE_SCHEDULE_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT_SCHEDULES,
+        async_export_schedules,
+        schema=EXPORT_SCHEDULES_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_IMPORT_SCHEDULES,
+        async_import_schedules,
+        schema=IMPORT_SCHEDULES_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_PROFILE,
+        async_set_profile,
+        schema=SET_PROFILE_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_DELETE_PROFILE,
+        async_delete_profile,
+        schema=DELETE_PROFILE_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_ASSIGN_PROFILE,
+        async_assign_profile,
+        schema=ASSIGN_PROFILE_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REPLACE_PROGRAM,
+        async_replace_program,
+        schema=REPLACE_PROGRAM_SCHEMA,
     )
     hass.services.async_register(
         DOMAIN,
         SERVICE_SET_HOLD,
         async_set_hold,
-        schema=vol.Schema({
-            vol.Required("entity_id"): cv.entity_id,
-            vol.Required("temperature"): vol.Coerce(float),
-            vol.Optional("mode", default="temporary"): vol.In(["temporary", "permanent"]),
-            vol.Optional("until"): cv.string,
-        }),
+        schema=SET_HOLD_SCHEMA,
     )
     hass.services.async_register(
         DOMAIN,
         SERVICE_CLEAR_HOLD,
         async_clear_hold,
-        schema=vol.Schema({vol.Required("entity_id"): cv.entity_id}),
+        schema=CLEAR_HOLD_SCHEMA,
     )
 
     hass.services.async_register(
@@ -609,4 +1704,16 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         schema=DEBUG_INFO_SCHEMA,
     )
     
-    _LOGGER.info("Enhanced Z-Wave Thermostat services registered")
\ No newline at end of file
+    _LOGGER.info("Enhanced Z-Wave Thermostat services registered")
+
+
+async def async_unload_services(hass: HomeAssistant) -> None:
+    """Remove the services and unload the shared schedule manager."""
+    for service in SERVICES:
+        hass.services.async_remove(DOMAIN, service)
+
+    schedule_manager: Optional[ScheduleManager] = hass.data[DOMAIN].pop("schedule_manager", None)
+    if schedule_manager is not None:
+        await schedule_manager.async_unload()
+
+    _LOGGER.info("Enhanced Z-Wave Thermostat services removed")
\ No newline at end of file
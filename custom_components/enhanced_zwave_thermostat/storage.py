@@ -0,0 +1,220 @@
+"""Journaled persistence for Enhanced Z-Wave Thermostat schedules.
+
+State is kept as a snapshot in a regular Home Assistant Store plus an
+append-only journal of per-mutation records next to it. Saving a change
+appends one small JSON line instead of rewriting every schedule; once the
+journal grows past a threshold it is folded back into the snapshot.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, DEFAULT_SAVE_DELAY
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 3
+STORAGE_KEY = f"{DOMAIN}_schedules"
+
+# Journal records to accumulate before compacting into the snapshot
+JOURNAL_COMPACT_THRESHOLD = 500
+
+
+class _ScheduleStore(Store):
+    """Snapshot store with migration from the monolithic version 2 format."""
+
+    async def _async_migrate_func(
+        self, old_major_version: int, old_minor_version: int, old_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        if old_major_version < 3:
+            # Version 2 held the full state without a journal position
+            old_data = {
+                "schedules": old_data.get("schedules", {}),
+                "holds": old_data.get("holds", {}),
+                "overrides": {},
+                "seq": 0,
+            }
+        return old_data
+
+
+class ScheduleStorage:
+    """Snapshot plus append-only journal backend used by ScheduleManager.
+
+    Every record gets a monotonically increasing sequence number. The
+    snapshot remembers the last sequence it includes, so records already
+    folded into it are skipped on replay even if the journal could not be
+    truncated before a crash.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        snapshot_func: Callable[[], Dict[str, Any]],
+        save_delay: float = DEFAULT_SAVE_DELAY,
+        compact_threshold: int = JOURNAL_COMPACT_THRESHOLD,
+    ):
+        self.hass = hass
+        self._store = _ScheduleStore(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._journal_path = Path(hass.config.path(".storage", f"{STORAGE_KEY}.journal"))
+        self._snapshot_func = snapshot_func
+        self._save_delay = save_delay
+        self._compact_threshold = compact_threshold
+        self._seq = 0
+        self._pending: List[str] = []
+        self._journal_len = 0
+        self._lock = asyncio.Lock()
+        self._unsub_flush: Optional[CALLBACK_TYPE] = None
+        self._compact_task: Optional[asyncio.Task] = None
+        self._unsub_final_write = hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_FINAL_WRITE, self._async_final_write
+        )
+
+    async def async_load(self) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Return the snapshot data and the journal records newer than it."""
+        data = await self._store.async_load()
+        snapshot_seq = data.get("seq", 0) if data else 0
+        lines = await self.hass.async_add_executor_job(self._read_journal)
+        records: List[Dict[str, Any]] = []
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A torn final line from an interrupted append
+                _LOGGER.warning("Skipping unreadable schedule journal record")
+                continue
+            if record.get("seq", 0) > snapshot_seq:
+                records.append(record)
+        records.sort(key=lambda record: record["seq"])
+        self._seq = max([snapshot_seq] + [record["seq"] for record in records])
+        self._journal_len = len(lines)
+        _LOGGER.debug(
+            "Loaded schedule snapshot at seq %d with %d journal records to replay",
+            snapshot_seq, len(records),
+        )
+        return data, records
+
+    @property
+    def needs_compaction(self) -> bool:
+        """Return True once the journal has grown past the threshold."""
+        return self._journal_len >= self._compact_threshold
+
+    @callback
+    def async_append(self, record: Dict[str, Any]) -> None:
+        """Queue a mutation record for the journal."""
+        self.async_append_many([record])
+
+    @callback
+    def async_append_many(self, records: List[Dict[str, Any]]) -> None:
+        """Queue several mutation records to be written together."""
+        if not records:
+            return
+        for record in records:
+            self._seq += 1
+            self._pending.append(json.dumps({**record, "seq": self._seq}))
+        if self._save_delay <= 0:
+            self.hass.async_create_task(self.async_flush())
+        elif self._unsub_flush is None:
+            self._unsub_flush = async_call_later(
+                self.hass, self._save_delay, self._async_delayed_flush
+            )
+
+    @callback
+    def async_set_save_delay(self, save_delay: float) -> None:
+        """Change how long records are batched; a pending flush is rescheduled."""
+        self._save_delay = save_delay
+        if self._unsub_flush is None:
+            return
+        self._unsub_flush()
+        self._unsub_flush = None
+        if save_delay <= 0:
+            self.hass.async_create_task(self.async_flush())
+        else:
+            self._unsub_flush = async_call_later(
+                self.hass, save_delay, self._async_delayed_flush
+            )
+
+    @callback
+    def async_request_compaction(self) -> None:
+        """Fold the journal into a fresh snapshot in the background."""
+        if self._compact_task is None or self._compact_task.done():
+            self._compact_task = self.hass.async_create_task(self.async_compact())
+
+    async def _async_delayed_flush(self, _now) -> None:
+        self._unsub_flush = None
+        await self.async_flush()
+
+    async def _async_final_write(self, _event: Event) -> None:
+        self._unsub_final_write = None
+        await self.async_flush()
+
+    async def async_flush(self) -> None:
+        """Append all queued records to the journal now."""
+        if self._unsub_flush:
+            self._unsub_flush()
+            self._unsub_flush = None
+        async with self._lock:
+            if not self._pending:
+                return
+            lines, self._pending = self._pending, []
+            await self.hass.async_add_executor_job(self._append_journal, lines)
+            self._journal_len += len(lines)
+        if self.needs_compaction:
+            self.async_request_compaction()
+
+    async def async_close(self) -> None:
+        """Write queued records and release timers and listeners.
+
+        Used when the integration is unloaded; a later setup creates a new
+        storage instance that replays the journal from disk.
+        """
+        if self._unsub_final_write:
+            self._unsub_final_write()
+            self._unsub_final_write = None
+        if self._compact_task and not self._compact_task.done():
+            await self._compact_task
+        await self.async_flush()
+
+    async def async_compact(self) -> None:
+        """Write a snapshot of the current state and truncate the journal."""
+        async with self._lock:
+            # Captured together so the snapshot covers exactly seq <= snapshot_seq
+            snapshot_seq = self._seq
+            data = {**self._snapshot_func(), "seq": snapshot_seq}
+            await self._store.async_save(data)
+            await self.hass.async_add_executor_job(self._truncate_journal)
+            self._journal_len = 0
+            # Queued records up to snapshot_seq are now redundant
+            self._pending = [
+                line for line in self._pending if json.loads(line)["seq"] > snapshot_seq
+            ]
+        _LOGGER.debug("Compacted schedule journal at seq %d", snapshot_seq)
+
+    def _read_journal(self) -> List[str]:
+        try:
+            with self._journal_path.open(encoding="utf-8") as journal:
+                return [line for line in journal.read().splitlines() if line.strip()]
+        except FileNotFoundError:
+            return []
+
+    def _append_journal(self, lines: List[str]) -> None:
+        self._journal_path.parent.mkdir(parents=True, exist_ok=True)
+        payload = "\n".join(lines) + "\n"
+        with self._journal_path.open("a+b") as journal:
+            # Keep a torn last line from a crash from swallowing our first record
+            if journal.tell() > 0:
+                journal.seek(-1, 2)
+                if journal.read(1) != b"\n":
+                    payload = "\n" + payload
+            journal.write(payload.encode("utf-8"))
+
+    def _truncate_journal(self) -> None:
+        self._journal_path.unlink(missing_ok=True)
@@ -0,0 +1,109 @@
+"""WebSocket API for Enhanced Z-Wave Thermostat schedules.
+
+Full schedule lists are served here instead of through entity state
+attributes, so they are neither recorded nor pushed to every client on
+each temperature change. Subscribers receive the current list once and
+then only the individual changes.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+
+from .const import DOMAIN
+
+# Bump when message payloads change incompatibly; commands are namespaced by it
+WS_API_VERSION = 1
+WS_TYPE_PREFIX = f"{DOMAIN}/v{WS_API_VERSION}"
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the schedule WebSocket commands."""
+    websocket_api.async_register_command(hass, websocket_list_schedules)
+    websocket_api.async_register_command(hass, websocket_subscribe_schedules)
+    websocket_api.async_register_command(hass, websocket_list_profiles)
+
+
+def _schedule_payload(manager, entity_id: str) -> Dict[str, Any]:
+    return {
+        "api_version": WS_API_VERSION,
+        "entity_id": entity_id,
+        "etag": manager.etag(entity_id),
+        **manager.as_dict(entity_id),
+    }
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{WS_TYPE_PREFIX}/schedules",
+        vol.Required("entity_id"): cv.entity_id,
+    }
+)
+@callback
+def websocket_list_schedules(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: Dict[str, Any]
+) -> None:
+    """Return the schedules and hold for one thermostat."""
+    manager = hass.data.get(DOMAIN, {}).get("schedule_manager")
+    if manager is None:
+        connection.send_error(msg["id"], "not_ready", "Schedule manager is not loaded")
+        return
+    connection.send_result(msg["id"], _schedule_payload(manager, msg["entity_id"]))
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{WS_TYPE_PREFIX}/profiles",
+    }
+)
+@callback
+def websocket_list_profiles(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: Dict[str, Any]
+) -> None:
+    """Return every schedule profile and the thermostats following it."""
+    manager = hass.data.get(DOMAIN, {}).get("schedule_manager")
+    if manager is None:
+        connection.send_error(msg["id"], "not_ready", "Schedule manager is not loaded")
+        return
+    connection.send_result(
+        msg["id"], {"api_version": WS_API_VERSION, "profiles": manager.profiles()}
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{WS_TYPE_PREFIX}/schedules/subscribe",
+        vol.Required("entity_id"): cv.entity_id,
+    }
+)
+@callback
+def websocket_subscribe_schedules(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: Dict[str, Any]
+) -> None:
+    """Send the current schedules, then push each change as it happens."""
+    manager = hass.data.get(DOMAIN, {}).get("schedule_manager")
+    if manager is None:
+        connection.send_error(msg["id"], "not_ready", "Schedule manager is not loaded")
+        return
+    entity_id = msg["entity_id"]
+
+    @callback
+    def _forward_change(change: Dict[str, Any]) -> None:
+        if change["change"] != "unloaded":
+            # Lets the client pass expected_version without fetching again
+            change = {**change, "etag": manager.etag(entity_id)}
+        connection.send_message(websocket_api.event_message(msg["id"], change))
+
+    connection.subscriptions[msg["id"]] = manager.async_subscribe(entity_id, _forward_change)
+    connection.send_result(msg["id"])
+    connection.send_message(
+        websocket_api.event_message(
+            msg["id"], {"change": "snapshot", **_schedule_payload(manager, entity_id)}
+        )
+    )
@@ -62,7 +62,7 @@ const t$1=globalThis,i$1=t$1.trustedTypes,s$1=i$1?i$1.createPolicy("lit-html",{c
  * Copyright 2017 Google LLC
  * SPDX-License-Identifier: BSD-3-Clause
  */
-const t=t=>(e,o)=>{void 0!==o?o.addInitializer((()=>{customElements.define(t,e);})):customElements.define(t,e);};
+const t=t=>(e,o)=>{void 0!==o?o.addInitializer((()=>{customElements.get(t)||customElements.define(t,e);})):customElements.get(t)||customElements.define(t,e);};
 
 /**
  * @license
@@ -88,8 +88,66 @@ let EnhancedThermostatCard = class EnhancedThermostatCard extends i {
         if (!config.entity) {
             throw new Error('You need to define an entity');
         }
+        if (this.config && this.config.entity !== config.entity) {
+            this._unsubscribeSchedules();
+            this.schedules = [];
+        }
         this.config = config;
     }
+    disconnectedCallback() {
+        super.disconnectedCallback();
+        clearTimeout(this._resubscribeTimer);
+        this._unsubscribeSchedules();
+    }
+    _subscribeSchedules() {
+        if (this._scheduleUnsub || !this.hass || !this.config) {
+            return;
+        }
+        this._scheduleUnsub = this.hass.connection.subscribeMessage((msg) => this._handleScheduleChange(msg), {
+            type: 'enhanced_zwave_thermostat/v1/schedules/subscribe',
+            entity_id: this.config.entity,
+        });
+        const unsub = this._scheduleUnsub;
+        unsub.catch((error) => {
+            if (this._scheduleUnsub !== unsub) {
+                return;
+            }
+            this._scheduleUnsub = undefined;
+            if (error && error.code === 'not_ready') {
+                // Still setting up after a reload; try again shortly
+                clearTimeout(this._resubscribeTimer);
+                this._resubscribeTimer = setTimeout(() => this._subscribeSchedules(), 2000);
+                return;
+            }
+            console.error('Failed to subscribe to schedules:', error);
+        });
+    }
+    _unsubscribeSchedules() {
+        if (this._scheduleUnsub) {
+            this._scheduleUnsub.then((unsub) => unsub()).catch(() => { });
+            this._scheduleUnsub = undefined;
+        }
+    }
+    _handleScheduleChange(msg) {
+        if (msg.change === 'unloaded') {
+            // The integration is reloading; subscribe again once it is back
+            this._unsubscribeSchedules();
+            clearTimeout(this._resubscribeTimer);
+            this._resubscribeTimer = setTimeout(() => this._subscribeSchedules(), 2000);
+        }
+        else if (msg.change === 'snapshot' || msg.change === 'replace') {
+            this.schedules = msg.schedules || [];
+        }
+        else if (msg.change === 'delete') {
+            this.schedules = this.schedules.filter(s => s.id !== msg.schedule_id);
+        }
+        else if (msg.schedule) {
+            const others = this.schedules.filter(s => s.id !== msg.schedule.id);
+            this.schedules = others.length === this.schedules.length
+                ? [...this.schedules, msg.schedule]
+                : this.schedules.map(s => (s.id === msg.schedule.id ? msg.schedule : s));
+        }
+    }
     getCardSize() {
         return 4;
     }
@@ -391,10 +449,8 @@ let EnhancedThermostatCard = class EnhancedThermostatCard extends i {
         // Normalize HVAC mode (underlying entity may report heat_cool)
         const hvacMode = entity.state === 'heat_cool' ? 'auto' : entity.state;
         const presetMode = entity.attributes.preset_mode;
-        // Pull schedules from attributes if provided
-        if (entity.attributes.enhanced_schedules && Array.isArray(entity.attributes.enhanced_schedules)) {
-          this.schedules = entity.attributes.enhanced_schedules;
-        }
+        // Schedules arrive over the integration's WebSocket subscription
+        this._subscribeSchedules();
         return x `
       <div class="card-content">
         <div class="thermostat-display">
@@ -572,20 +628,14 @@ let EnhancedThermostatCard = class EnhancedThermostatCard extends i {
                 entity_id: this.config.entity,
                 schedule,
             });
-            // Success - close dialog and refresh schedules
+            // Success - the subscription delivers the new schedule
             this._closeScheduleDialog();
-            this._refreshSchedules();
         }
         catch (error) {
             console.error('Failed to create schedule:', error);
             alert(`Failed to create schedule: ${error.message || 'Unknown error'}`);
         }
     }
-    async _refreshSchedules() {
-        // In a real implementation, we'd fetch schedules from the integration
-        // For now, just trigger a state update
-        this.requestUpdate();
-    }
 };
 __decorate([
     n({ attribute: false }),
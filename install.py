@@ -42,20 +42,6 @@ def install_integration(ha_config_path, source_path):
     print("✅ Integration installed successfully")
 
 
-def install_card(ha_config_path, source_path):
-    """Install the Lovelace card."""
-    source_card = source_path / "www" / "enhanced-thermostat-card.js"
-    target_www = ha_config_path / "www"
-    target_card = target_www / "enhanced-thermostat-card.js"
-    
-    # Create www directory if it doesn't exist
-    target_www.mkdir(exist_ok=True)
-    
-    # Copy card file
-    shutil.copy2(source_card, target_card)
-    print("✅ Lovelace card installed successfully")
-
-
 def main():
     """Main installation process."""
     print("🏠 Enhanced Z-Wave Thermostat Installer")
@@ -79,22 +65,13 @@ def main():
         print("\n📦 Installing integration...")
         install_integration(ha_config_path, source_path)
         
-        # Install card
-        print("\n🎨 Installing Lovelace card...")
-        install_card(ha_config_path, source_path)
-        
         print("\n🎉 Installation completed successfully!")
         print("\n📋 Next steps:")
         print("1. Restart Home Assistant")
         print("2. Go to Settings > Devices & Services")
         print("3. Click 'Add Integration' and search for 'Enhanced Z-Wave Thermostat'")
-        print("4. Add the card resource:")
-        print("   - Go to Settings > Dashboards > Resources")
-        print("   - Click '+ Add Resource'")
-        print("   - URL: /local/enhanced-thermostat-card.js")
-        print("   - Type: JavaScript Module")
-        print("5. Hard refresh browser (Ctrl+F5)")
-        print("6. Add the card to your dashboard")
+        print("4. Hard refresh browser (Ctrl+F5)")
+        print("5. Add the card to your dashboard (it is loaded automatically)")
         
     except Exception as e:
         print(f"❌ Installation failed: {e}")
@@ -51,13 +51,6 @@ fi
 cp -r "$SCRIPT_DIR/custom_components/enhanced_zwave_thermostat" "$HA_CONFIG/custom_components/"
 echo "✅ Integration installed successfully"
 
-# Install card
-echo ""
-echo "🎨 Installing Lovelace card..."
-mkdir -p "$HA_CONFIG/www"
-cp "$SCRIPT_DIR/www/enhanced-thermostat-card.js" "$HA_CONFIG/www/"
-echo "✅ Lovelace card installed successfully"
-
 echo ""
 echo "🎉 Installation completed successfully!"
 echo ""
@@ -65,5 +58,4 @@ echo "📋 Next steps:"
 echo "1. Restart Home Assistant"
 echo "2. Go to Settings > Devices & Services"
 echo "3. Click 'Add Integration' and search for 'Enhanced Z-Wave Thermostat'"
-echo "4. Add the card resource: /local/enhanced-thermostat-card.js (JavaScript Module)"
-echo "5. Add the card to your dashboard"
\ No newline at end of file
+echo "4. Add the card to your dashboard (it is loaded automatically)"
\ No newline at end of file
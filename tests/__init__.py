@@ -0,0 +1 @@
+"""Tests for the Enhanced Z-Wave Thermostat integration."""
@@ -0,0 +1,72 @@
+"""Fixtures for Enhanced Z-Wave Thermostat tests."""
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.enhanced_zwave_thermostat.const import (
+    CONF_SELECTED_CLIMATE_ENTITY,
+    DOMAIN,
+)
+from custom_components.enhanced_zwave_thermostat.storage import ScheduleStorage
+
+from .const import SOURCE_ENTITY
+
+pytest_plugins = "pytest_homeassistant_custom_component"
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Load the integration from custom_components in every test."""
+    yield
+
+
+@pytest.fixture(autouse=True)
+def schedule_journal(tmp_path: Path) -> Path:
+    """Keep the schedule journal out of the shared test config directory.
+
+    The snapshot goes through the mocked Store, but the journal is a plain
+    file and would otherwise leak between tests and runs.
+    """
+    journal = tmp_path / "schedule.journal"
+    init = ScheduleStorage.__init__
+
+    def _init(self, *args, **kwargs) -> None:
+        init(self, *args, **kwargs)
+        self._journal_path = journal
+
+    with patch.object(ScheduleStorage, "__init__", _init):
+        yield journal
+
+
+@pytest.fixture
+def config_entry(hass: HomeAssistant) -> MockConfigEntry:
+    """Return an entry wrapping a registered Z-Wave climate entity at 68°."""
+    er.async_get(hass).async_get_or_create(
+        "climate",
+        "zwave_js",
+        "node_2",
+        suggested_object_id="living_room",
+        original_name="Living Room",
+    )
+    hass.states.async_set(SOURCE_ENTITY, "heat", {"temperature": 68})
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Living Room",
+        data={CONF_SELECTED_CLIMATE_ENTITY: SOURCE_ENTITY},
+    )
+    entry.add_to_hass(hass)
+    return entry
+
+
+@pytest.fixture
+async def init_integration(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> MockConfigEntry:
+    """Set up the integration with the entry and return it."""
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    return config_entry
@@ -0,0 +1,4 @@
+"""Constants for Enhanced Z-Wave Thermostat tests."""
+
+SOURCE_ENTITY = "climate.living_room"
+ENTITY = "climate.enhanced_living_room"
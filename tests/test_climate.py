@@ -0,0 +1,107 @@
+"""Tests for the Enhanced Z-Wave Thermostat climate entity."""
+from datetime import timedelta
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+    async_mock_service,
+)
+
+from custom_components.enhanced_zwave_thermostat.climate import EnhancedZWaveThermostat
+from custom_components.enhanced_zwave_thermostat.const import DOMAIN
+
+from .const import ENTITY
+
+ALL_WEEK = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+
+async def _async_advance(hass: HomeAssistant, seconds: float) -> None:
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=seconds))
+    await hass.async_block_till_done()
+
+
+async def test_reload_with_confirmed_setpoint_sends_nothing(
+    hass: HomeAssistant, init_integration: MockConfigEntry
+) -> None:
+    """The schedule catch-up after a reload skips a setpoint the device reports."""
+    await hass.services.async_call(
+        DOMAIN,
+        "replace_program",
+        {
+            "entity_id": ENTITY,
+            "schedules": [{"weekdays": ALL_WEEK, "time": "00:00", "temperature": 68}],
+        },
+        blocking=True,
+    )
+    await hass.services.async_call(
+        "climate",
+        "set_preset_mode",
+        {"entity_id": ENTITY, "preset_mode": "schedule"},
+        blocking=True,
+    )
+    await _async_advance(hass, 60)
+    writes = async_mock_service(hass, "climate", "set_temperature")
+
+    assert await hass.config_entries.async_reload(init_integration.entry_id)
+    await hass.async_block_till_done()
+    # Past the debounce, the schedule jitter and every acknowledgement retry
+    for seconds in (60, 120, 240, 480):
+        await _async_advance(hass, seconds)
+
+    assert hass.states.get(ENTITY).attributes["preset_mode"] == "schedule"
+    assert writes == []
+
+
+async def test_schedule_and_hold_changes_update_attributes(
+    hass: HomeAssistant, init_integration: MockConfigEntry
+) -> None:
+    """Schedule and hold changes reach the state outside schedule mode."""
+    await hass.services.async_call(
+        DOMAIN,
+        "set_schedule",
+        {
+            "entity_id": ENTITY,
+            "schedule": {"weekdays": ["mon"], "time": "07:00", "temperature": 70},
+        },
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+    assert hass.states.get(ENTITY).attributes["enhanced_schedules_count"] == 1
+
+    await hass.services.async_call(
+        DOMAIN,
+        "set_hold",
+        {"entity_id": ENTITY, "temperature": 64, "mode": "permanent"},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+    assert hass.states.get(ENTITY).attributes["enhanced_hold_temperature"] == 64
+
+
+async def test_safety_override_bypasses_limits_only_for_itself(
+    hass: HomeAssistant, init_integration: MockConfigEntry
+) -> None:
+    """Other setpoints stay clamped while a safety override is active."""
+    with patch.object(
+        EnhancedZWaveThermostat, "_async_write_setpoint", autospec=True
+    ) as write:
+        await hass.services.async_call(
+            DOMAIN,
+            "override_safety",
+            {"entity_id": ENTITY, "temperature": 35, "duration": 60},
+            blocking=True,
+        )
+        await _async_advance(hass, 60)
+        assert write.call_args.args[1] == 35
+
+        await hass.services.async_call(
+            "climate",
+            "set_temperature",
+            {"entity_id": ENTITY, "temperature": 95},
+            blocking=True,
+        )
+        await _async_advance(hass, 60)
+        assert write.call_args.args[1] == 90
@@ -0,0 +1,95 @@
+"""Tests for the setpoint dispatcher and acknowledgement tracker."""
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.enhanced_zwave_thermostat.commands import SetpointAckTracker
+
+from .const import SOURCE_ENTITY
+
+
+async def _async_advance(hass: HomeAssistant, seconds: float) -> None:
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=seconds))
+    await hass.async_block_till_done()
+
+
+async def test_ack_on_reported_setpoint(hass: HomeAssistant) -> None:
+    """A matching report acknowledges the setpoint and stops the timeout."""
+    hass.states.async_set(SOURCE_ENTITY, "heat", {"temperature": 66})
+    tracker = SetpointAckTracker(hass, timeout=10, max_retries=3)
+    resends = []
+
+    tracker.async_expect(SOURCE_ENTITY, 70, lambda: resends.append(70))
+    tracker.async_sent(SOURCE_ENTITY)
+    tracker.async_observe(SOURCE_ENTITY, 70)
+    await _async_advance(hass, 60)
+
+    assert resends == []
+    assert tracker.metrics()[SOURCE_ENTITY]["acked"] == 1
+    assert not tracker.metrics()[SOURCE_ENTITY]["pending"]
+
+
+async def test_ack_when_already_reported(hass: HomeAssistant) -> None:
+    """A setpoint the entity already reports needs no later state change."""
+    hass.states.async_set(SOURCE_ENTITY, "heat", {"temperature": 70})
+    tracker = SetpointAckTracker(hass, timeout=10, max_retries=3)
+    resends = []
+
+    tracker.async_expect(SOURCE_ENTITY, 70, lambda: resends.append(70))
+    tracker.async_sent(SOURCE_ENTITY)
+    await _async_advance(hass, 60)
+
+    assert resends == []
+    assert tracker.metrics()[SOURCE_ENTITY]["acked"] == 1
+
+
+async def test_retry_until_acknowledged(hass: HomeAssistant) -> None:
+    """An unconfirmed setpoint is resent with a doubling timeout."""
+    hass.states.async_set(SOURCE_ENTITY, "heat", {"temperature": 66})
+    tracker = SetpointAckTracker(hass, timeout=10, max_retries=3)
+    resends = []
+
+    def _resend() -> None:
+        resends.append(70)
+        tracker.async_sent(SOURCE_ENTITY)
+
+    tracker.async_expect(SOURCE_ENTITY, 70, _resend)
+    tracker.async_sent(SOURCE_ENTITY)
+    await _async_advance(hass, 11)
+    assert len(resends) == 1
+    # The second timeout is twice as long
+    await _async_advance(hass, 11)
+    assert len(resends) == 1
+
+    tracker.async_observe(SOURCE_ENTITY, 70)
+    await _async_advance(hass, 120)
+
+    assert len(resends) == 1
+    metrics = tracker.metrics()[SOURCE_ENTITY]
+    assert metrics["acked"] == 1
+    assert metrics["retries"] == 1
+    assert metrics["failed"] == 0
+
+
+async def test_give_up_after_max_retries(hass: HomeAssistant) -> None:
+    """A setpoint never confirmed is counted as failed after the last retry."""
+    hass.states.async_set(SOURCE_ENTITY, "heat", {"temperature": 66})
+    tracker = SetpointAckTracker(hass, timeout=10, max_retries=2)
+    resends = []
+
+    def _resend() -> None:
+        resends.append(70)
+        tracker.async_sent(SOURCE_ENTITY)
+
+    tracker.async_expect(SOURCE_ENTITY, 70, _resend)
+    tracker.async_sent(SOURCE_ENTITY)
+    for seconds in (11, 32, 73, 160):
+        await _async_advance(hass, seconds)
+
+    assert len(resends) == 2
+    metrics = tracker.metrics()[SOURCE_ENTITY]
+    assert metrics["retries"] == 2
+    assert metrics["failed"] == 1
+    assert not metrics["pending"]
@@ -0,0 +1,126 @@
+"""Tests for setting up, reloading and unloading the integration."""
+from datetime import timedelta
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import CoreState, HomeAssistant
+from homeassistant.helpers.dispatcher import DATA_DISPATCHER
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.enhanced_zwave_thermostat.const import (
+    CONF_MAX_CONCURRENT_COMMANDS,
+    CONF_SAVE_DELAY,
+    CONF_SCHEDULE_JITTER,
+    DOMAIN,
+)
+
+from .const import ENTITY
+
+
+async def _async_resource_counts(hass: HomeAssistant) -> dict[str, int]:
+    """Count bus listeners, dispatcher connections and pending timers.
+
+    Time is moved on first so delayed registry saves don't count.
+    """
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=60))
+    await hass.async_block_till_done()
+    return {
+        "bus": sum(hass.bus.async_listeners().values()),
+        "dispatcher": sum(len(targets) for targets in hass.data.get(DATA_DISPATCHER, {}).values()),
+        "timers": sum(not handle.cancelled() for handle in hass.loop._scheduled),
+    }
+
+
+async def test_reload_does_not_leak_listeners(
+    hass: HomeAssistant, init_integration: MockConfigEntry
+) -> None:
+    """Reloading the entry releases everything the previous setup added."""
+    entry = init_integration
+    baseline = await _async_resource_counts(hass)
+
+    for _ in range(100):
+        dispatcher = hass.data[DOMAIN]["dispatcher"]
+        ack_tracker = hass.data[DOMAIN]["ack_tracker"]
+        assert await hass.config_entries.async_reload(entry.entry_id)
+        await hass.async_block_till_done()
+        # The previous shared objects hold nothing once replaced
+        assert dispatcher.metrics()["queue_depth"] == 0
+        assert dispatcher.metrics()["delayed"] == 0
+        assert not ack_tracker._pending
+
+    assert entry.state is ConfigEntryState.LOADED
+    assert await _async_resource_counts(hass) == baseline
+
+
+async def test_unload_removes_shared_state(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """Unloading the last entry releases everything setup added."""
+    baseline = await _async_resource_counts(hass)
+    # Not started yet, so the card setup waits on a started listener
+    hass.set_state(CoreState.not_running)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert hass.data[DOMAIN]["card_setup"] is not None
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert DOMAIN not in hass.data
+    assert await _async_resource_counts(hass) == baseline
+
+
+async def test_reload_notifies_schedule_subscribers(
+    hass: HomeAssistant, init_integration: MockConfigEntry, hass_ws_client
+) -> None:
+    """Subscribers are told when the schedule manager goes away."""
+    entry = init_integration
+    entity_id = ENTITY
+    client = await hass_ws_client(hass)
+
+    await client.send_json_auto_id(
+        {"type": f"{DOMAIN}/v1/schedules/subscribe", "entity_id": entity_id}
+    )
+    assert (await client.receive_json())["success"]
+    assert (await client.receive_json())["event"]["change"] == "snapshot"
+
+    assert await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    event = (await client.receive_json())["event"]
+    assert event == {"change": "unloaded", "entity_id": entity_id}
+
+    # The integration is back, so subscribing again works
+    await client.send_json_auto_id(
+        {"type": f"{DOMAIN}/v1/schedules/subscribe", "entity_id": entity_id}
+    )
+    assert (await client.receive_json())["success"]
+
+
+async def test_shared_options_apply_without_reload(
+    hass: HomeAssistant, init_integration: MockConfigEntry
+) -> None:
+    """Shared settings reach the running dispatcher and store in place."""
+    entry = init_integration
+    domain_data = hass.data[DOMAIN]
+    dispatcher = domain_data["dispatcher"]
+    manager = domain_data["schedule_manager"]
+
+    hass.config_entries.async_update_entry(
+        entry,
+        options={
+            CONF_SAVE_DELAY: 0,
+            CONF_MAX_CONCURRENT_COMMANDS: 5,
+            CONF_SCHEDULE_JITTER: 0,
+        },
+    )
+    await hass.async_block_till_done()
+
+    assert domain_data["dispatcher"] is dispatcher
+    assert domain_data["schedule_manager"] is manager
+    assert dispatcher.metrics()["max_concurrent"] == 5
+    assert dispatcher._schedule_jitter == 0
+    assert manager._storage._save_delay == 0
@@ -0,0 +1,113 @@
+"""Tests for the schedule services."""
+import pytest
+import voluptuous as vol
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+)
+
+from custom_components.enhanced_zwave_thermostat.const import DOMAIN
+
+from .const import ENTITY
+
+
+@pytest.mark.parametrize("weekdays", [["mon", "funday"], ["someday"], []])
+async def test_set_schedule_rejects_unknown_weekdays(
+    hass: HomeAssistant, init_integration: MockConfigEntry, weekdays: list[str]
+) -> None:
+    """A slot without valid weekdays would never fire, so it is refused."""
+    with pytest.raises((vol.Invalid, ServiceValidationError)):
+        await hass.services.async_call(
+            DOMAIN,
+            "set_schedule",
+            {
+                "entity_id": ENTITY,
+                "schedule": {"weekdays": weekdays, "time": "07:00", "temperature": 70},
+            },
+            blocking=True,
+        )
+
+    assert hass.data[DOMAIN]["schedule_manager"].list(ENTITY) == []
+
+
+async def test_replace_program_rejects_unknown_weekdays(
+    hass: HomeAssistant, init_integration: MockConfigEntry
+) -> None:
+    """Programs report unknown weekday names instead of storing dead slots."""
+    with pytest.raises(Exception, match="funday"):
+        await hass.services.async_call(
+            DOMAIN,
+            "replace_program",
+            {
+                "entity_id": ENTITY,
+                "schedules": [
+                    {"weekdays": ["mon", "funday"], "time": "07:00", "temperature": 70}
+                ],
+            },
+            blocking=True,
+        )
+
+    assert hass.data[DOMAIN]["schedule_manager"].list(ENTITY) == []
+
+
+async def test_toggle_all_checks_version_once(
+    hass: HomeAssistant, init_integration: MockConfigEntry
+) -> None:
+    """Toggling every schedule with the current etag succeeds; a stale one fails."""
+    manager = hass.data[DOMAIN]["schedule_manager"]
+    await hass.services.async_call(
+        DOMAIN,
+        "replace_program",
+        {
+            "entity_id": ENTITY,
+            "schedules": [
+                {"weekdays": ["mon"], "time": "07:00", "temperature": 70},
+                {"weekdays": ["mon"], "time": "22:00", "temperature": 64},
+            ],
+        },
+        blocking=True,
+    )
+    etag = manager.etag(ENTITY)
+
+    await hass.services.async_call(
+        DOMAIN,
+        "toggle_schedule",
+        {"entity_id": ENTITY, "enabled": False, "expected_version": etag},
+        blocking=True,
+    )
+    assert [slot["enabled"] for slot in manager.list(ENTITY)] == [False, False]
+
+    with pytest.raises(Exception, match="changed by someone else"):
+        await hass.services.async_call(
+            DOMAIN,
+            "toggle_schedule",
+            {"entity_id": ENTITY, "enabled": True, "expected_version": etag},
+            blocking=True,
+        )
+    assert [slot["enabled"] for slot in manager.list(ENTITY)] == [False, False]
+
+
+async def test_get_schedules_response_and_event(
+    hass: HomeAssistant, init_integration: MockConfigEntry
+) -> None:
+    """get_schedules answers with a response, or an event without one."""
+    response = await hass.services.async_call(
+        DOMAIN,
+        "get_schedules",
+        {"entity_id": ENTITY},
+        blocking=True,
+        return_response=True,
+    )
+    assert response["schedules"] == []
+    assert not response["not_modified"]
+
+    events = async_capture_events(hass, f"{DOMAIN}_schedule_updated")
+    await hass.services.async_call(
+        DOMAIN, "get_schedules", {"entity_id": ENTITY}, blocking=True
+    )
+
+    assert len(events) == 1
+    assert events[0].data["change"] == "queried"
+    assert events[0].data["entity_ids"] == [ENTITY]
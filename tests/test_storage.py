@@ -0,0 +1,176 @@
+"""Tests for the journaled schedule storage."""
+import json
+from pathlib import Path
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.enhanced_zwave_thermostat.const import DOMAIN
+from custom_components.enhanced_zwave_thermostat.storage import (
+    STORAGE_KEY,
+    STORAGE_VERSION,
+    ScheduleStorage,
+)
+
+from .const import ENTITY
+
+
+def _storage(hass: HomeAssistant, state: dict[str, Any] | None = None) -> ScheduleStorage:
+    return ScheduleStorage(hass, lambda: dict(state or {}), save_delay=0)
+
+
+def _record(number: int) -> dict[str, Any]:
+    return {"op": "hold", "entity_id": ENTITY, "hold": {"temperature": number}}
+
+
+async def test_journal_replay(hass: HomeAssistant) -> None:
+    """Flushed records are replayed in order with their sequence numbers."""
+    storage = _storage(hass)
+    storage.async_append(_record(1))
+    storage.async_append_many([_record(2), _record(3)])
+    await storage.async_close()
+
+    data, records = await _storage(hass).async_load()
+
+    assert data is None
+    assert [record["seq"] for record in records] == [1, 2, 3]
+    assert [record["hold"]["temperature"] for record in records] == [1, 2, 3]
+
+
+async def test_torn_last_line(hass: HomeAssistant, schedule_journal: Path) -> None:
+    """A line cut short by a crash is skipped and doesn't swallow the next one."""
+    schedule_journal.write_text(
+        json.dumps({**_record(1), "seq": 1}) + "\n" + '{"op": "hold", "se',
+        encoding="utf-8",
+    )
+
+    storage = _storage(hass)
+    _, records = await storage.async_load()
+    assert [record["seq"] for record in records] == [1]
+
+    storage.async_append(_record(2))
+    await storage.async_close()
+    _, records = await _storage(hass).async_load()
+
+    assert [record["seq"] for record in records] == [1, 2]
+
+
+async def test_snapshot_seq_filters_journal(
+    hass: HomeAssistant, hass_storage: dict[str, Any], schedule_journal: Path
+) -> None:
+    """Records already in the snapshot are skipped if truncation didn't happen."""
+    hass_storage[STORAGE_KEY] = {
+        "version": STORAGE_VERSION,
+        "minor_version": 1,
+        "key": STORAGE_KEY,
+        "data": {"schedules": {}, "holds": {}, "overrides": {}, "seq": 2},
+    }
+    schedule_journal.write_text(
+        "".join(json.dumps({**_record(seq), "seq": seq}) + "\n" for seq in (1, 2, 3)),
+        encoding="utf-8",
+    )
+
+    storage = _storage(hass)
+    data, records = await storage.async_load()
+
+    assert data["seq"] == 2
+    assert [record["seq"] for record in records] == [3]
+    # New records continue after the highest sequence seen
+    storage.async_append(_record(4))
+    await storage.async_close()
+    _, records = await _storage(hass).async_load()
+    assert [record["seq"] for record in records] == [3, 4]
+
+
+async def test_compaction(
+    hass: HomeAssistant, hass_storage: dict[str, Any], schedule_journal: Path
+) -> None:
+    """Compaction folds the journal into the snapshot and removes it."""
+    state = {"schedules": {}, "holds": {ENTITY: {"temperature": 3}}, "overrides": {}}
+    storage = _storage(hass, state)
+    storage.async_append_many([_record(1), _record(2), _record(3)])
+    await storage.async_flush()
+
+    await storage.async_compact()
+    await storage.async_close()
+
+    assert not schedule_journal.exists()
+    assert hass_storage[STORAGE_KEY]["data"] == {**state, "seq": 3}
+    data, records = await _storage(hass).async_load()
+    assert data["holds"] == state["holds"]
+    assert records == []
+
+
+async def test_migrate_from_version_2(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """The monolithic version 2 store loads as a snapshot at sequence 0."""
+    schedules = {
+        ENTITY: [
+            {
+                "id": "morning",
+                "weekdays": ["mon"],
+                "time": "07:00",
+                "temperature": 70,
+                "enabled": True,
+            }
+        ]
+    }
+    hass_storage[STORAGE_KEY] = {
+        "version": 2,
+        "minor_version": 1,
+        "key": STORAGE_KEY,
+        "data": {"schedules": schedules, "holds": {}},
+    }
+
+    data, records = await _storage(hass).async_load()
+
+    assert data == {"schedules": schedules, "holds": {}, "overrides": {}, "seq": 0}
+    assert records == []
+
+
+async def test_schedules_survive_reload(
+    hass: HomeAssistant, init_integration: MockConfigEntry
+) -> None:
+    """Schedules saved through the journal are there after a reload."""
+    await hass.services.async_call(
+        DOMAIN,
+        "set_schedule",
+        {
+            "entity_id": ENTITY,
+            "schedule": {"weekdays": ["mon"], "time": "07:00", "temperature": 70},
+        },
+        blocking=True,
+    )
+
+    assert await hass.config_entries.async_reload(init_integration.entry_id)
+    await hass.async_block_till_done()
+
+    schedules = hass.data[DOMAIN]["schedule_manager"].list(ENTITY)
+    assert [(slot["time"], slot["temperature"]) for slot in schedules] == [("07:00", 70)]
+
+
+async def test_dangling_assignment_detached_on_load(
+    hass: HomeAssistant, hass_storage: dict[str, Any], config_entry: MockConfigEntry
+) -> None:
+    """An assignment to a missing profile falls back to the own schedules."""
+    hass_storage[STORAGE_KEY] = {
+        "version": STORAGE_VERSION,
+        "minor_version": 1,
+        "key": STORAGE_KEY,
+        "data": {
+            "schedules": {},
+            "profiles": {},
+            "assignments": {ENTITY: "gone"},
+            "holds": {},
+            "overrides": {},
+            "seq": 0,
+        },
+    }
+
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    manager = hass.data[DOMAIN]["schedule_manager"]
+    assert manager.as_dict(ENTITY) == {"schedules": [], "profile_id": None, "hold": None}
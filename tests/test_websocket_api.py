@@ -0,0 +1,35 @@
+"""Tests for the schedule WebSocket API."""
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.enhanced_zwave_thermostat.const import DOMAIN
+
+from .const import ENTITY
+
+
+async def test_subscription_changes_carry_etag(
+    hass: HomeAssistant, init_integration: MockConfigEntry, hass_ws_client
+) -> None:
+    """Every change event carries the etag to use as expected_version."""
+    client = await hass_ws_client(hass)
+    await client.send_json_auto_id(
+        {"type": f"{DOMAIN}/v1/schedules/subscribe", "entity_id": ENTITY}
+    )
+    assert (await client.receive_json())["success"]
+    snapshot = (await client.receive_json())["event"]
+
+    await hass.services.async_call(
+        DOMAIN,
+        "set_schedule",
+        {
+            "entity_id": ENTITY,
+            "schedule": {"weekdays": ["mon"], "time": "07:00", "temperature": 70},
+            "expected_version": snapshot["etag"],
+        },
+        blocking=True,
+    )
+    event = (await client.receive_json())["event"]
+
+    assert event["change"] == "add"
+    assert event["etag"] != snapshot["etag"]
+    assert event["etag"] == hass.data[DOMAIN]["schedule_manager"].etag(ENTITY)